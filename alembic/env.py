@@ -1,18 +1,9 @@
+import logging
 import os
-import sys
 from logging.config import fileConfig
 
-from sqlalchemy import create_engine, engine_from_config, pool
-
 from alembic import context
 
-# Add the src directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
-# Import our models
-from brownie_metadata_db.database.base import Base
-from brownie_metadata_db.database.models import *  # Import all models
-
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -22,9 +13,25 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-# add your model's MetaData object here
-# for 'autogenerate' support
-target_metadata = Base.metadata
+# Debug output goes through the "alembic" logger (INFO in alembic.ini), so the
+# connection details below are only formatted when DEBUG is explicitly enabled.
+logger = logging.getLogger("alembic.env")
+
+# Model MetaData for 'autogenerate' support, loaded on first use
+_target_metadata = None
+
+
+def get_target_metadata():
+    """Import the models and return their MetaData."""
+    global _target_metadata
+    if _target_metadata is None:
+        from brownie_metadata_db.database.base import Base
+        from brownie_metadata_db.database.models import load_models
+
+        load_models()  # Register all models
+        _target_metadata = Base.metadata
+    return _target_metadata
+
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -45,17 +52,54 @@ def run_migrations_offline() -> None:
 
     """
     url = config.get_main_option("sqlalchemy.url")
+    # Autogenerate never runs offline, so the models are not imported here;
+    # include_object only loads them if Alembic consults the filter
     context.configure(
         url=url,
-        target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
         context.run_migrations()
 
 
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Limit autogenerate to tables defined by this application's models."""
+    if type_ == "table":
+        return name in get_target_metadata().tables
+    return True
+
+
+def already_at_target(connection) -> bool:
+    """Check whether the database is already at the requested revision.
+
+    Only used when ``BROWNIE_ALEMBIC_FAST_NOOP=1``, so the common "upgrade
+    head" no-op finishes after a single SELECT on alembic_version.
+    """
+    if os.environ.get("BROWNIE_ALEMBIC_FAST_NOOP", "").lower() not in ("1", "true"):
+        return False
+
+    try:
+        target = context.get_revision_argument()
+    except KeyError:
+        # Commands without a destination (revision, check) always run
+        return False
+    if not target:
+        return False
+
+    from alembic.runtime.migration import MigrationContext
+
+    targets = set(target) if isinstance(target, tuple) else {target}
+    current = MigrationContext.configure(connection).get_current_heads()
+
+    # The SELECT autobegins a transaction; end it so Alembic manages its own
+    # transactions instead of running inside an external, uncommitted one
+    connection.rollback()
+    return set(current) == targets
+
+
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode.
 
@@ -63,63 +107,48 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
-    # Override the database URL with environment variables if available
-    configuration = config.get_section(config.config_ini_section, {})
-
-    # Get database connection details from environment variables
-    db_host = os.getenv("DB_HOST", "localhost")
-    db_port = os.getenv("DB_PORT", "5432")
-    db_name = os.getenv("DB_NAME", "brownie_metadata")
-    db_user = os.getenv("DB_USER", "brownie-fastapi-server")
-    db_password = os.getenv("DB_PASSWORD", "")
-    db_ssl_mode = os.getenv("DB_SSL_MODE", "verify-full")
-
-    # Construct the database URL (SSL mode will be handled in connect_args)
-    if db_password:
-        database_url = (
-            f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
-        )
-    else:
-        database_url = f"postgresql://{db_user}@{db_host}:{db_port}/{db_name}"
-    configuration["sqlalchemy.url"] = database_url
-
-    # Add SSL parameters for certificate authentication
-    connect_args = {}
-    ssl_mode = os.getenv("DB_SSL_MODE", "verify-full")
-
-    if ssl_mode in ["require", "verify-ca", "verify-full", "prefer"]:
-        connect_args["sslmode"] = ssl_mode
-
-        # Add certificate paths if available
-        from brownie_metadata_db.certificates.config import CertificateConfig
-
-        # Create a new config instance to pick up environment variables
-        cert_config = CertificateConfig()
-        cert_paths = cert_config.get_client_cert_paths()
-        client_cert = cert_paths["client_cert"]
-        client_key = cert_paths["client_key"]
-        ca_cert = cert_paths["ca_cert"]
-
-        if os.path.exists(client_cert) and os.path.exists(client_key):
-            connect_args["sslcert"] = client_cert
-            connect_args["sslkey"] = client_key
-
-        if os.path.exists(ca_cert):
-            connect_args["sslrootcert"] = ca_cert
-    elif ssl_mode == "disable":
-        # For disable mode, explicitly disable SSL
-        connect_args["sslmode"] = "disable"
-
-    # Create engine directly with SSL parameters
-    database_url = configuration["sqlalchemy.url"]
-    connectable = create_engine(
-        database_url,
-        poolclass=pool.NullPool,
-        connect_args=connect_args,
+    from brownie_metadata_db.database.migration_env import (
+        build_connect_args,
+        build_database_url,
+        get_migration_engine,
+        get_migration_env,
     )
 
+    # Environment lookups, the URL and SSL arguments are resolved once per
+    # process and cached
+    env = get_migration_env()
+    database_url = build_database_url(env)
+    connect_args = build_connect_args(env)
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Connecting to %s:%s/%s as %s (sslmode=%s, connect_args=%s)",
+            env.host,
+            env.port,
+            env.name,
+            env.user,
+            env.ssl_mode,
+            sorted(connect_args),
+        )
+
+    # Reuse a pooled engine with SSL parameters across in-process runs
+    connectable = get_migration_engine(database_url, connect_args)
+
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        if already_at_target(connection):
+            logger.info("Database is already at the target revision")
+            return
+
+        # One transaction per revision keeps a failed revision from rolling
+        # back the ones before it; PostgreSQL runs DDL transactionally
+        context.configure(
+            connection=connection,
+            target_metadata=get_target_metadata(),
+            include_object=include_object,
+            include_schemas=False,
+            transaction_per_migration=True,
+            transactional_ddl=True,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,64 @@
+"""Composite organization/team indexes
+
+Revision ID: 1e76bd03a7b8
+Revises: d607e412e7b0
+Create Date: 2026-10-16 09:12:41.503218
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "1e76bd03a7b8"
+down_revision: Union[str, Sequence[str], None] = "d607e412e7b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Team-scoped tables are filtered by organization and team together. A
+# composite (organization_id, team_id) index serves those queries and, as
+# organization_id is its leading column, also replaces the single-column
+# organization_id index.
+TEAM_SCOPED_TABLES = ("users", "incidents", "agent_configs", "stats", "configs")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table in TEAM_SCOPED_TABLES:
+            op.create_index(
+                f"ix_{table}_organization_id_team_id",
+                table,
+                ["organization_id", "team_id"],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_organization_id",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for table in TEAM_SCOPED_TABLES:
+            op.create_index(
+                f"ix_{table}_organization_id",
+                table,
+                ["organization_id"],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+            op.drop_index(
+                f"ix_{table}_organization_id_team_id",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
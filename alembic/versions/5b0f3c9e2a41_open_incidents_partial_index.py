@@ -0,0 +1,45 @@
+"""Partial index on open incidents
+
+Revision ID: 5b0f3c9e2a41
+Revises: 1e76bd03a7b8
+Create Date: 2026-10-16 11:02:17.846390
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5b0f3c9e2a41"
+down_revision: Union[str, Sequence[str], None] = "1e76bd03a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_incidents_open",
+            "incidents",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("status = 'OPEN'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_incidents_open",
+            table_name="incidents",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
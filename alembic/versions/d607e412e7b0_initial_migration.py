@@ -6,11 +6,14 @@ Create Date: 2025-10-15 20:46:57.628539
 
 """
 
-from typing import Sequence, Union
+from typing import Dict, List, Sequence, Tuple, Union
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql.named_types import CreateEnumType, DropEnumType
+from sqlalchemy.schema import CreateIndex, CreateTable
 
-from alembic import op
+from alembic import context, op
 
 # revision identifiers, used by Alembic.
 revision: str = "d607e412e7b0"
@@ -18,12 +21,158 @@ down_revision: Union[str, Sequence[str], None] = None
 branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
+# Enum types are created once up front, so columns must not create them again
+USER_ROLE = postgresql.ENUM(
+    "ADMIN", "MEMBER", "VIEWER", name="userrole", create_type=False
+)
+INCIDENT_STATUS = postgresql.ENUM(
+    "OPEN",
+    "IN_PROGRESS",
+    "RESOLVED",
+    "CLOSED",
+    "CANCELLED",
+    name="incidentstatus",
+    create_type=False,
+)
+INCIDENT_PRIORITY = postgresql.ENUM(
+    "LOW", "MEDIUM", "HIGH", "CRITICAL", name="incidentpriority", create_type=False
+)
+AGENT_TYPE = postgresql.ENUM(
+    "INCIDENT_RESPONSE",
+    "MONITORING",
+    "ANALYSIS",
+    "NOTIFICATION",
+    "CUSTOM",
+    name="agenttype",
+    create_type=False,
+)
+CONFIG_TYPE = postgresql.ENUM(
+    "ORGANIZATION",
+    "TEAM",
+    "ALERT",
+    "AGENT",
+    "GLOBAL",
+    name="configtype",
+    create_type=False,
+)
+CONFIG_STATUS = postgresql.ENUM(
+    "DRAFT", "ACTIVE", "DEPRECATED", "ARCHIVED", name="configstatus", create_type=False
+)
+ENUM_TYPES = (
+    USER_ROLE,
+    INCIDENT_STATUS,
+    INCIDENT_PRIORITY,
+    AGENT_TYPE,
+    CONFIG_TYPE,
+    CONFIG_STATUS,
+)
 
-def upgrade() -> None:
-    """Upgrade schema."""
-    # Create organizations table
-    op.create_table(
-        "organizations",
+# Indexes created with each table, as (name, columns). Names are spelled out
+# so the revision does not depend on a MetaData naming convention.
+INDEXES: Dict[str, Tuple[Tuple[str, Tuple[str, ...]], ...]] = {
+    "organizations": (("ix_organizations_slug", ("slug",)),),
+    "teams": (
+        ("ix_teams_org_id", ("org_id",)),
+        ("ix_teams_organization_id", ("organization_id",)),
+    ),
+    "users": (
+        ("ix_users_email", ("email",)),
+        ("ix_users_oidc_subject", ("oidc_subject",)),
+        ("ix_users_org_id", ("org_id",)),
+        ("ix_users_organization_id", ("organization_id",)),
+        ("ix_users_team_id", ("team_id",)),
+        ("ix_users_username", ("username",)),
+    ),
+    "incidents": (
+        ("ix_incidents_assigned_to", ("assigned_to",)),
+        ("ix_incidents_created_by", ("created_by",)),
+        ("ix_incidents_org_id", ("org_id",)),
+        ("ix_incidents_organization_id", ("organization_id",)),
+        ("ix_incidents_team_id", ("team_id",)),
+        ("ix_incidents_idempotency_key", ("idempotency_key",)),
+    ),
+    "agent_configs": (
+        ("ix_agent_configs_org_id", ("org_id",)),
+        ("ix_agent_configs_organization_id", ("organization_id",)),
+        ("ix_agent_configs_team_id", ("team_id",)),
+    ),
+    "stats": (
+        ("ix_stats_metric_name", ("metric_name",)),
+        ("ix_stats_timestamp", ("timestamp",)),
+        ("ix_stats_org_id", ("org_id",)),
+        ("ix_stats_organization_id", ("organization_id",)),
+        ("ix_stats_team_id", ("team_id",)),
+    ),
+    "configs": (
+        ("ix_configs_org_id", ("org_id",)),
+        ("ix_configs_organization_id", ("organization_id",)),
+        ("ix_configs_team_id", ("team_id",)),
+        ("ix_configs_config_type", ("config_type",)),
+        ("ix_configs_status", ("status",)),
+        ("ix_configs_priority", ("priority",)),
+        ("ix_configs_is_active", ("is_active",)),
+    ),
+}
+
+
+class _SchemaBuilder:
+    """Issue table and index DDL through ``op``, or batch it into one statement.
+
+    With ``fast_bootstrap = true`` in the Alembic config, DDL is compiled up
+    front and sent to the database in a single round trip by ``flush()``.
+    ``fast_index = true`` does the same for index DDL only, once all tables
+    have been created.
+    """
+
+    def __init__(self, batch: bool, defer_indexes: bool = False) -> None:
+        self.batch = batch
+        self.defer_indexes = defer_indexes
+        self.metadata = sa.MetaData()
+        self.statements: List[str] = []
+
+    def _render(self, ddl: sa.schema.ExecutableDDLElement) -> None:
+        self.statements.append(str(ddl.compile(dialect=op.get_context().dialect)))
+
+    def create_enum(self, enum: postgresql.ENUM) -> None:
+        if self.batch:
+            self._render(CreateEnumType(enum))
+        elif context.is_offline_mode():
+            op.execute(CreateEnumType(enum))
+        else:
+            enum.create(op.get_bind(), checkfirst=True)
+
+    def create_table(self, name: str, *elements: sa.schema.SchemaItem) -> None:
+        if not self.batch:
+            op.create_table(name, *elements)
+            return
+
+        self._render(CreateTable(sa.Table(name, self.metadata, *elements)))
+
+    def create_indexes(self, table_name: str) -> None:
+        for name, columns in INDEXES[table_name]:
+            if not (self.batch or self.defer_indexes):
+                op.create_index(name, table_name, list(columns), unique=False)
+                continue
+
+            # Index DDL only needs the column names, not the full table
+            table = sa.Table(table_name, sa.MetaData(), *map(sa.Column, columns))
+            self._render(CreateIndex(sa.Index(name, *table.c)))
+
+    def flush(self) -> None:
+        if self.statements:
+            op.execute(";\n".join(s.strip() for s in self.statements))
+            self.statements = []
+
+
+def _config_flag(name: str) -> bool:
+    """Check whether a boolean option is enabled in the Alembic config."""
+    option = context.config.get_main_option(name, "false")
+    return option.lower() == "true"
+
+
+def _base_columns() -> List[sa.Column]:
+    """Columns shared by every table: the id and BaseModel timestamps."""
+    return [
         sa.Column("id", sa.UUID(), nullable=False),
         sa.Column(
             "created_at",
@@ -37,6 +186,35 @@ def upgrade() -> None:
             server_default=sa.text("now()"),
             nullable=False,
         ),
+    ]
+
+
+def _org_scoped_columns() -> List[sa.Column]:
+    """Columns from OrgScopedMixin."""
+    return [sa.Column("org_id", sa.UUID(), nullable=False)]
+
+
+def _audit_columns() -> List[sa.Column]:
+    """Columns from AuditMixin."""
+    return [
+        sa.Column("created_by", sa.UUID(), nullable=True),
+        sa.Column("updated_by", sa.UUID(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    schema = _SchemaBuilder(
+        batch=_config_flag("fast_bootstrap"), defer_indexes=_config_flag("fast_index")
+    )
+
+    for enum in ENUM_TYPES:
+        schema.create_enum(enum)
+
+    # Create organizations table
+    schema.create_table(
+        "organizations",
+        *_base_columns(),
         sa.Column("name", sa.String(length=255), nullable=False),
         sa.Column("slug", sa.String(length=100), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
@@ -51,29 +229,14 @@ def upgrade() -> None:
         sa.UniqueConstraint("name"),
         sa.UniqueConstraint("slug"),
     )
-    op.create_index(
-        op.f("ix_organizations_slug"), "organizations", ["slug"], unique=False
-    )
+    schema.create_indexes("organizations")
 
     # Create teams table
-    op.create_table(
+    schema.create_table(
         "teams",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
-        sa.Column("created_by", sa.UUID(), nullable=True),
-        sa.Column("updated_by", sa.UUID(), nullable=True),
+        *_base_columns(),
+        *_org_scoped_columns(),
+        *_audit_columns(),
         sa.Column("name", sa.String(length=255), nullable=False),
         sa.Column("slug", sa.String(length=100), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
@@ -89,30 +252,14 @@ def upgrade() -> None:
         ),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(op.f("ix_teams_org_id"), "teams", ["org_id"], unique=False)
-    op.create_index(
-        op.f("ix_teams_organization_id"), "teams", ["organization_id"], unique=False
-    )
+    schema.create_indexes("teams")
 
     # Create users table
-    op.create_table(
+    schema.create_table(
         "users",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
-        sa.Column("created_by", sa.UUID(), nullable=True),
-        sa.Column("updated_by", sa.UUID(), nullable=True),
+        *_base_columns(),
+        *_org_scoped_columns(),
+        *_audit_columns(),
         sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
         sa.Column("deleted_by", sa.UUID(), nullable=True),
         sa.Column("email", sa.String(length=255), nullable=False),
@@ -127,7 +274,7 @@ def upgrade() -> None:
         sa.Column("team_id", sa.UUID(), nullable=False),
         sa.Column(
             "role",
-            sa.Enum("ADMIN", "MEMBER", "VIEWER", name="userrole"),
+            USER_ROLE,
             nullable=False,
         ),
         sa.Column("preferences", sa.JSON(), nullable=True),
@@ -141,55 +288,26 @@ def upgrade() -> None:
         sa.UniqueConstraint("oidc_subject"),
         sa.UniqueConstraint("username"),
     )
-    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=False)
-    op.create_index(
-        op.f("ix_users_oidc_subject"), "users", ["oidc_subject"], unique=False
-    )
-    op.create_index(op.f("ix_users_org_id"), "users", ["org_id"], unique=False)
-    op.create_index(
-        op.f("ix_users_organization_id"), "users", ["organization_id"], unique=False
-    )
-    op.create_index(op.f("ix_users_team_id"), "users", ["team_id"], unique=False)
-    op.create_index(op.f("ix_users_username"), "users", ["username"], unique=False)
+    schema.create_indexes("users")
 
     # Create incidents table
-    op.create_table(
+    schema.create_table(
         "incidents",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
-        sa.Column("created_by", sa.UUID(), nullable=True),
-        sa.Column("updated_by", sa.UUID(), nullable=True),
+        *_base_columns(),
+        *_org_scoped_columns(),
+        *_audit_columns(),
         sa.Column("version", sa.Integer(), nullable=False),
         sa.Column("idempotency_key", sa.String(length=255), nullable=True),
         sa.Column("title", sa.String(length=500), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
         sa.Column(
             "status",
-            sa.Enum(
-                "OPEN",
-                "IN_PROGRESS",
-                "RESOLVED",
-                "CLOSED",
-                "CANCELLED",
-                name="incidentstatus",
-            ),
+            INCIDENT_STATUS,
             nullable=False,
         ),
         sa.Column(
             "priority",
-            sa.Enum("LOW", "MEDIUM", "HIGH", "CRITICAL", name="incidentpriority"),
+            INCIDENT_PRIORITY,
             nullable=False,
         ),
         sa.Column("assigned_to", sa.UUID(), nullable=True),
@@ -211,61 +329,20 @@ def upgrade() -> None:
         sa.PrimaryKeyConstraint("id"),
         sa.UniqueConstraint("idempotency_key"),
     )
-    op.create_index(
-        op.f("ix_incidents_assigned_to"), "incidents", ["assigned_to"], unique=False
-    )
-    op.create_index(
-        op.f("ix_incidents_created_by"), "incidents", ["created_by"], unique=False
-    )
-    op.create_index(op.f("ix_incidents_org_id"), "incidents", ["org_id"], unique=False)
-    op.create_index(
-        op.f("ix_incidents_organization_id"),
-        "incidents",
-        ["organization_id"],
-        unique=False,
-    )
-    op.create_index(
-        op.f("ix_incidents_team_id"), "incidents", ["team_id"], unique=False
-    )
-    op.create_index(
-        op.f("ix_incidents_idempotency_key"),
-        "incidents",
-        ["idempotency_key"],
-        unique=False,
-    )
+    schema.create_indexes("incidents")
 
     # Create agent_configs table
-    op.create_table(
+    schema.create_table(
         "agent_configs",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
-        sa.Column("created_by", sa.UUID(), nullable=True),
-        sa.Column("updated_by", sa.UUID(), nullable=True),
+        *_base_columns(),
+        *_org_scoped_columns(),
+        *_audit_columns(),
         sa.Column("version", sa.Integer(), nullable=False),
         sa.Column("name", sa.String(length=255), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
         sa.Column(
             "agent_type",
-            sa.Enum(
-                "INCIDENT_RESPONSE",
-                "MONITORING",
-                "ANALYSIS",
-                "NOTIFICATION",
-                "CUSTOM",
-                name="agenttype",
-            ),
+            AGENT_TYPE,
             nullable=False,
         ),
         sa.Column("is_active", sa.Boolean(), nullable=False),
@@ -288,36 +365,13 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["team_id"], ["teams.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
-        op.f("ix_agent_configs_org_id"), "agent_configs", ["org_id"], unique=False
-    )
-    op.create_index(
-        op.f("ix_agent_configs_organization_id"),
-        "agent_configs",
-        ["organization_id"],
-        unique=False,
-    )
-    op.create_index(
-        op.f("ix_agent_configs_team_id"), "agent_configs", ["team_id"], unique=False
-    )
+    schema.create_indexes("agent_configs")
 
     # Create stats table
-    op.create_table(
+    schema.create_table(
         "stats",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
+        *_base_columns(),
+        *_org_scoped_columns(),
         sa.Column("metric_name", sa.String(length=255), nullable=False),
         sa.Column("metric_type", sa.String(length=50), nullable=False),
         sa.Column("value", sa.Float(), nullable=False),
@@ -335,48 +389,25 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["team_id"], ["teams.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(
-        op.f("ix_stats_metric_name"), "stats", ["metric_name"], unique=False
-    )
-    op.create_index(op.f("ix_stats_timestamp"), "stats", ["timestamp"], unique=False)
-    op.create_index(op.f("ix_stats_org_id"), "stats", ["org_id"], unique=False)
-    op.create_index(
-        op.f("ix_stats_organization_id"), "stats", ["organization_id"], unique=False
-    )
-    op.create_index(op.f("ix_stats_team_id"), "stats", ["team_id"], unique=False)
+    schema.create_indexes("stats")
 
     # Create configs table
-    op.create_table(
+    schema.create_table(
         "configs",
-        sa.Column("id", sa.UUID(), nullable=False),
-        sa.Column(
-            "created_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column(
-            "updated_at",
-            sa.DateTime(timezone=True),
-            server_default=sa.text("now()"),
-            nullable=False,
-        ),
-        sa.Column("org_id", sa.UUID(), nullable=False),
-        sa.Column("created_by", sa.UUID(), nullable=True),
-        sa.Column("updated_by", sa.UUID(), nullable=True),
+        *_base_columns(),
+        *_org_scoped_columns(),
+        *_audit_columns(),
         sa.Column("version", sa.Integer(), nullable=False),
         sa.Column("name", sa.String(length=255), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
         sa.Column(
             "config_type",
-            sa.Enum(
-                "ORGANIZATION", "TEAM", "ALERT", "AGENT", "GLOBAL", name="configtype"
-            ),
+            CONFIG_TYPE,
             nullable=False,
         ),
         sa.Column(
             "status",
-            sa.Enum("DRAFT", "ACTIVE", "DEPRECATED", "ARCHIVED", name="configstatus"),
+            CONFIG_STATUS,
             nullable=False,
         ),
         sa.Column("name_pattern", sa.String(length=500), nullable=True),
@@ -398,64 +429,24 @@ def upgrade() -> None:
         sa.ForeignKeyConstraint(["team_id"], ["teams.id"], ondelete="CASCADE"),
         sa.PrimaryKeyConstraint("id"),
     )
-    op.create_index(op.f("ix_configs_org_id"), "configs", ["org_id"], unique=False)
-    op.create_index(
-        op.f("ix_configs_organization_id"), "configs", ["organization_id"], unique=False
-    )
-    op.create_index(op.f("ix_configs_team_id"), "configs", ["team_id"], unique=False)
-    op.create_index(
-        op.f("ix_configs_config_type"), "configs", ["config_type"], unique=False
-    )
-    op.create_index(op.f("ix_configs_status"), "configs", ["status"], unique=False)
-    op.create_index(op.f("ix_configs_priority"), "configs", ["priority"], unique=False)
-    op.create_index(
-        op.f("ix_configs_is_active"), "configs", ["is_active"], unique=False
-    )
+    schema.create_indexes("configs")
+
+    schema.flush()
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_index(op.f("ix_configs_is_active"), table_name="configs")
-    op.drop_index(op.f("ix_configs_priority"), table_name="configs")
-    op.drop_index(op.f("ix_configs_status"), table_name="configs")
-    op.drop_index(op.f("ix_configs_config_type"), table_name="configs")
-    op.drop_index(op.f("ix_configs_team_id"), table_name="configs")
-    op.drop_index(op.f("ix_configs_organization_id"), table_name="configs")
-    op.drop_index(op.f("ix_configs_org_id"), table_name="configs")
+    # Dropping a table drops its indexes too
     op.drop_table("configs")
-    op.drop_index(op.f("ix_stats_team_id"), table_name="stats")
-    op.drop_index(op.f("ix_stats_organization_id"), table_name="stats")
-    op.drop_index(op.f("ix_stats_org_id"), table_name="stats")
-    op.drop_index(op.f("ix_stats_timestamp"), table_name="stats")
-    op.drop_index(op.f("ix_stats_metric_name"), table_name="stats")
     op.drop_table("stats")
-
-    op.drop_index(op.f("ix_agent_configs_team_id"), table_name="agent_configs")
-    op.drop_index(op.f("ix_agent_configs_organization_id"), table_name="agent_configs")
-    op.drop_index(op.f("ix_agent_configs_org_id"), table_name="agent_configs")
     op.drop_table("agent_configs")
-
-    op.drop_index(op.f("ix_incidents_idempotency_key"), table_name="incidents")
-    op.drop_index(op.f("ix_incidents_team_id"), table_name="incidents")
-    op.drop_index(op.f("ix_incidents_organization_id"), table_name="incidents")
-    op.drop_index(op.f("ix_incidents_org_id"), table_name="incidents")
-    op.drop_index(op.f("ix_incidents_created_by"), table_name="incidents")
-    op.drop_index(op.f("ix_incidents_assigned_to"), table_name="incidents")
     op.drop_table("incidents")
-
-    op.drop_index(op.f("ix_users_username"), table_name="users")
-    op.drop_index(op.f("ix_users_team_id"), table_name="users")
-    op.drop_index(op.f("ix_users_organization_id"), table_name="users")
-    op.drop_index(op.f("ix_users_org_id"), table_name="users")
-    op.drop_index(op.f("ix_users_oidc_subject"), table_name="users")
-    op.drop_index(op.f("ix_users_email"), table_name="users")
     op.drop_table("users")
-
-    op.drop_index(op.f("ix_teams_organization_id"), table_name="teams")
-    op.drop_index(op.f("ix_teams_org_id"), table_name="teams")
     op.drop_table("teams")
-
-    op.drop_index(op.f("ix_organizations_slug"), table_name="organizations")
     op.drop_table("organizations")
 
-    # Drop enums (SQLAlchemy will handle this automatically)
+    for enum in reversed(ENUM_TYPES):
+        if context.is_offline_mode():
+            op.execute(DropEnumType(enum))
+        else:
+            enum.drop(op.get_bind(), checkfirst=True)
@@ -1,27 +1,60 @@
 """Brownie Metadata Database - A comprehensive database management library."""
 
-from .backup import BackupManager, BackupProvider, LocalProvider, S3Provider
+from typing import TYPE_CHECKING
+
+from ._lazy import make_lazy
 from .certificates import CertificateConfig, CertificateValidator, cert_config
-from .database import get_database_manager, get_session
-from .database.models import (
-    AgentConfig,
-    AgentType,
-    Config,
-    ConfigStatus,
-    ConfigType,
-    Incident,
-    IncidentPriority,
-    IncidentStatus,
-    Organization,
-    Stats,
-    Team,
-    User,
-    UserRole,
-)
 from .logging import AuditLogger, LoggingConfig, PerformanceLogger, configure_logging
 
+if TYPE_CHECKING:
+    from .backup import BackupManager, BackupProvider, LocalProvider, S3Provider
+    from .database import get_database_manager, get_session
+    from .database.models import (
+        AgentConfig,
+        AgentType,
+        Config,
+        ConfigStatus,
+        ConfigType,
+        Incident,
+        IncidentPriority,
+        IncidentStatus,
+        Organization,
+        Stats,
+        Team,
+        User,
+        UserRole,
+    )
+
 __version__ = "0.1.0"
 
+# The database layer, models and the optional backup subsystem are imported on
+# first access, so each entry point only loads the parts it actually uses
+# (e.g. the backup CLI skips SQLAlchemy mapper configuration).
+_LAZY_IMPORTS = {
+    "get_database_manager": ".database",
+    "get_session": ".database",
+    "Organization": ".database.models",
+    "Team": ".database.models",
+    "User": ".database.models",
+    "UserRole": ".database.models",
+    "Incident": ".database.models",
+    "IncidentStatus": ".database.models",
+    "IncidentPriority": ".database.models",
+    "AgentConfig": ".database.models",
+    "AgentType": ".database.models",
+    "Stats": ".database.models",
+    "Config": ".database.models",
+    "ConfigType": ".database.models",
+    "ConfigStatus": ".database.models",
+    "BackupManager": ".backup",
+    "BackupProvider": ".backup",
+    "S3Provider": ".backup",
+    "LocalProvider": ".backup",
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
+
 __all__ = [
     # Database
     "get_database_manager",
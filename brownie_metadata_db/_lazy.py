@@ -0,0 +1,36 @@
+"""Lazy attribute loading for package ``__init__`` modules (PEP 562)."""
+
+import importlib
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+
+def make_lazy(
+    module_globals: Dict[str, Any], mapping: Mapping[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """Build the module ``__getattr__`` and ``__dir__`` for a package.
+
+    Args:
+        module_globals: The package's ``globals()``
+        mapping: Exported name to the (relative) module that defines it
+
+    Returns:
+        Tuple of (``__getattr__``, ``__dir__``). Each name is imported on
+        first access and then stored in the package globals.
+    """
+    package = module_globals["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        """Import a lazily exported name on first access."""
+        module_name = mapping.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+        value = getattr(importlib.import_module(module_name, package), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        """List the package globals together with the lazy exports."""
+        return sorted(set(module_globals) | set(mapping))
+
+    return __getattr__, __dir__
@@ -1,7 +1,25 @@
 """Backup system for Brownie Metadata Database."""
 
-from .cli import main
-from .manager import BackupManager
-from .providers import BackupProvider, LocalProvider, S3Provider
+from typing import TYPE_CHECKING
+
+from .._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .cli import main
+    from .manager import BackupManager
+    from .providers import BackupProvider, LocalProvider, S3Provider
+
+# Submodules load on first access, so running the CLI does not import the
+# manager and providers until a command actually needs them
+_LAZY_IMPORTS = {
+    "main": ".cli",
+    "BackupManager": ".manager",
+    "BackupProvider": ".providers",
+    "S3Provider": ".providers",
+    "LocalProvider": ".providers",
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
 
 __all__ = ["main", "BackupManager", "BackupProvider", "S3Provider", "LocalProvider"]
@@ -2,21 +2,23 @@
 """Backup CLI for Brownie Metadata Database."""
 
 import argparse
-import os
+import io
 import sys
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import structlog
 
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from .config import BackupConfig
-from .manager import BackupManager
+if TYPE_CHECKING:
+    from .manager import BackupManager
 
 logger = structlog.get_logger(__name__)
 
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+BACKUP_ROW_FORMAT = "{:<30} {:<12} {:<20} {:<10}\n"
+SEPARATOR = "-" * 80 + "\n"
+
 
 def main() -> int:
     """Main CLI entry point."""
@@ -29,12 +31,14 @@ def main() -> int:
     backup_parser.add_argument(
         "--verify", action="store_true", help="Verify backup after creation"
     )
+    backup_parser.set_defaults(func=backup_command)
 
     # List command
     list_parser = subparsers.add_parser("list", help="List available backups")
     list_parser.add_argument(
         "--limit", type=int, default=10, help="Limit number of backups to show"
     )
+    list_parser.set_defaults(func=list_command)
 
     # Restore command
     restore_parser = subparsers.add_parser("restore", help="Restore from backup")
@@ -42,15 +46,18 @@ def main() -> int:
     restore_parser.add_argument(
         "--force", action="store_true", help="Force restore without confirmation"
     )
+    restore_parser.set_defaults(func=restore_command)
 
     # Cleanup command
     cleanup_parser = subparsers.add_parser("cleanup", help="Clean up old backups")
     cleanup_parser.add_argument(
         "--dry-run", action="store_true", help="Show what would be deleted"
     )
+    cleanup_parser.set_defaults(func=cleanup_command)
 
     # Status command
     status_parser = subparsers.add_parser("status", help="Show backup status")
+    status_parser.set_defaults(func=status_command)
 
     args = parser.parse_args()
 
@@ -59,35 +66,26 @@ def main() -> int:
         return 1
 
     # Configure centralized logging
-    from ..logging.config import LoggingConfig, configure_logging
+    from ..logging.config import configure_logging
 
-    logging_config = LoggingConfig()
-    configure_logging(logging_config)
+    configure_logging()
+
+    # Imported after argument parsing so --help and usage errors stay fast
+    from .config import BackupConfig
+    from .manager import BackupManager
 
     try:
         backup_config = BackupConfig()
         manager = BackupManager(backup_config)
 
-        if args.command == "backup":
-            return backup_command(manager, args)
-        elif args.command == "list":
-            return list_command(manager, args)
-        elif args.command == "restore":
-            return restore_command(manager, args)
-        elif args.command == "cleanup":
-            return cleanup_command(manager, args)
-        elif args.command == "status":
-            return status_command(manager, args)
-        else:
-            parser.print_help()
-            return 1
+        return args.func(manager, args)
 
     except Exception as e:
         logger.error("Backup operation failed", error=str(e), exc_info=True)
         return 1
 
 
-def backup_command(manager: BackupManager, args: argparse.Namespace) -> int:
+def backup_command(manager: "BackupManager", args: argparse.Namespace) -> int:
     """Create a backup."""
     backup_name = args.name or f"backup-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
 
@@ -109,7 +107,7 @@ def backup_command(manager: BackupManager, args: argparse.Namespace) -> int:
         return 1
 
 
-def list_command(manager: BackupManager, args: argparse.Namespace) -> int:
+def list_command(manager: "BackupManager", args: argparse.Namespace) -> int:
     """List available backups."""
     try:
         backups = manager.list_backups(limit=args.limit)
@@ -118,16 +116,23 @@ def list_command(manager: BackupManager, args: argparse.Namespace) -> int:
             print("No backups found")
             return 0
 
-        print(f"\n📦 Available Backups (showing {len(backups)}):")
-        print("-" * 80)
-        print(f"{'Name':<30} {'Size':<12} {'Created':<20} {'Status':<10}")
-        print("-" * 80)
-
-        for backup in backups:
-            size_str = format_size(backup.get("size", 0))
-            created_str = backup.get("created", "Unknown")
-            status = backup.get("status", "Unknown")
-            print(f"{backup['name']:<30} {size_str:<12} {created_str:<20} {status:<10}")
+        # Build the whole listing and write it to stdout once
+        out = io.StringIO()
+        out.write(f"\n📦 Available Backups (showing {len(backups)}):\n")
+        out.write(SEPARATOR)
+        out.write(BACKUP_ROW_FORMAT.format("Name", "Size", "Created", "Status"))
+        out.write(SEPARATOR)
+        row = BACKUP_ROW_FORMAT.format
+        out.writelines(
+            row(
+                backup["name"],
+                format_size(backup.get("size", 0)),
+                backup.get("created", "Unknown"),
+                backup.get("status", "Unknown"),
+            )
+            for backup in backups
+        )
+        sys.stdout.write(out.getvalue())
 
         return 0
     except Exception as e:
@@ -136,7 +141,7 @@ def list_command(manager: BackupManager, args: argparse.Namespace) -> int:
         return 1
 
 
-def restore_command(manager: BackupManager, args: argparse.Namespace) -> int:
+def restore_command(manager: "BackupManager", args: argparse.Namespace) -> int:
     """Restore from backup."""
     if not args.force:
         confirm = input(
@@ -163,7 +168,7 @@ def restore_command(manager: BackupManager, args: argparse.Namespace) -> int:
         return 1
 
 
-def cleanup_command(manager: BackupManager, args: argparse.Namespace) -> int:
+def cleanup_command(manager: "BackupManager", args: argparse.Namespace) -> int:
     """Clean up old backups."""
     try:
         if args.dry_run:
@@ -172,10 +177,14 @@ def cleanup_command(manager: BackupManager, args: argparse.Namespace) -> int:
                 print("No old backups to clean up")
                 return 0
 
-            print("\n🗑️  Old backups that would be deleted (dry run):")
-            print("-" * 50)
-            for backup in old_backups:
-                print(f"  - {backup['name']} ({backup.get('created', 'Unknown')})")
+            out = io.StringIO()
+            out.write("\n🗑️  Old backups that would be deleted (dry run):\n")
+            out.write("-" * 50 + "\n")
+            out.writelines(
+                f"  - {backup['name']} ({backup.get('created', 'Unknown')})\n"
+                for backup in old_backups
+            )
+            sys.stdout.write(out.getvalue())
             return 0
         else:
             deleted_count = manager.cleanup_old_backups()
@@ -187,20 +196,23 @@ def cleanup_command(manager: BackupManager, args: argparse.Namespace) -> int:
         return 1
 
 
-def status_command(manager: BackupManager, args: argparse.Namespace) -> int:
+def status_command(manager: "BackupManager", args: argparse.Namespace) -> int:
     """Show backup status."""
     try:
         status = manager.get_status()
 
-        print("\n📊 Backup Status:")
-        print("-" * 40)
-        print(f"Provider: {status['provider']}")
-        print(f"Destination: {status['destination']}")
-        print(f"Schedule: {status['schedule']}")
-        print(f"Retention: {status['retention_days']} days")
-        print(f"Last Backup: {status.get('last_backup', 'Never')}")
-        print(f"Total Backups: {status.get('total_backups', 0)}")
-        print(f"Total Size: {format_size(status.get('total_size', 0))}")
+        lines = [
+            "\n📊 Backup Status:",
+            "-" * 40,
+            f"Provider: {status['provider']}",
+            f"Destination: {status['destination']}",
+            f"Schedule: {status['schedule']}",
+            f"Retention: {status['retention_days']} days",
+            f"Last Backup: {status.get('last_backup', 'Never')}",
+            f"Total Backups: {status.get('total_backups', 0)}",
+            f"Total Size: {format_size(status.get('total_size', 0))}",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return 0
     except Exception as e:
@@ -214,14 +226,9 @@ def format_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0 B"
 
-    size_names = ["B", "KB", "MB", "GB", "TB"]
-    i = 0
-    size_float = float(size_bytes)
-    while size_float >= 1024 and i < len(size_names) - 1:
-        size_float /= 1024.0
-        i += 1
-
-    return f"{size_float:.1f} {size_names[i]}"
+    # Each unit is 2**10 of the previous one, so the bit length picks it
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * i)):.1f} {SIZE_UNITS[i]}"
 
 
 if __name__ == "__main__":
@@ -1,11 +1,14 @@
 """Backup configuration and settings."""
 
 import os
-from typing import Optional
+from functools import cached_property
+from typing import Literal, Optional
 
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+CLOUD_PROVIDERS = frozenset({"s3", "gcs", "azure"})
+
 
 class BackupConfig(BaseSettings):
     """Backup configuration settings."""
@@ -23,9 +26,27 @@ class BackupConfig(BaseSettings):
         default="0 2 * * *", description="Cron schedule for automated backups"
     )
     retention_days: int = Field(default=30, description="Days to keep backups")
+    server_side_retention: bool = Field(
+        default=False,
+        description="Expire backups with a storage lifecycle rule instead of "
+        "client-side cleanup (S3)",
+    )
 
     # Backup settings
     compression: bool = Field(default=True, description="Enable compression")
+    compression_level: int = Field(
+        default=1, ge=1, le=9, description="Compression level (1-9)"
+    )
+    compression_algorithm: Literal["gzip", "zstd"] = Field(
+        default="gzip", description="Compression algorithm for plain dumps"
+    )
+    compression_threads: int = Field(
+        default=1, ge=1, description="Compression threads (>1 uses pigz if installed)"
+    )
+    backup_format: Literal["plain", "custom"] = Field(
+        default="plain",
+        description="Dump format: plain (gzipped SQL) or custom (pg_dump -Fc)",
+    )
     encryption: bool = Field(default=True, description="Enable encryption")
     parallel_jobs: int = Field(default=2, description="Number of parallel backup jobs")
     backup_timeout: int = Field(default=3600, description="Backup timeout in seconds")
@@ -59,7 +80,7 @@ class BackupConfig(BaseSettings):
     class Config:
         env_prefix = "BACKUP_"
 
-    @property
+    @cached_property
     def database_url(self) -> str:
         """Get the database URL for pg_dump."""
         if self.db_password:
@@ -67,10 +88,10 @@ class BackupConfig(BaseSettings):
         else:
             return f"postgresql://{self.db_user}@{self.db_host}:{self.db_port}/{self.db_name}"
 
-    @property
+    @cached_property
     def is_cloud_provider(self) -> bool:
         """Check if using a cloud provider."""
-        return self.provider in ["s3", "gcs", "azure"]
+        return self.provider in CLOUD_PROVIDERS
 
     @property
     def requires_credentials(self) -> bool:
@@ -3,18 +3,55 @@
 import os
 import subprocess
 import tempfile
+import threading
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
 
 import structlog
 
 from .config import BackupConfig
-from .providers import BackupProvider, LocalProvider, S3Provider
+from .providers import (
+    COMPRESSED_SUFFIXES,
+    COPY_BUFFER_SIZE,
+    CUSTOM_DUMP_MAGIC,
+    CUSTOM_DUMP_SUFFIX,
+    BackupProvider,
+    LocalProvider,
+    S3Provider,
+    compression_writer,
+    open_compression_writer,
+    open_decompressed,
+)
 
 logger = structlog.get_logger(__name__)
 
+# First line of a plain-format pg_dump
+DUMP_HEADER = b"-- PostgreSQL database dump"
+
+
+class _DumpStreamReader:
+    """Read end of the dump pipe that fails at EOF if the dump failed.
+
+    A pipe closed after a failed dump looks like a normal EOF; raising
+    instead makes the provider abort its upload.
+    """
+
+    def __init__(self, pipe: IO[bytes]):
+        self.pipe = pipe
+        self.failed = threading.Event()
+
+    def read(self, size: int = -1) -> bytes:
+        # Buffered pipe reads only come back short at EOF
+        data = self.pipe.read(size)
+        if (size < 0 or len(data) < size) and self.failed.is_set():
+            raise RuntimeError("pg_dump failed; aborting upload")
+        return data
+
+    def close(self) -> None:
+        self.pipe.close()
+
 
 class BackupManager:
     """Manages backup operations for the database."""
@@ -40,35 +77,50 @@ class BackupManager:
         self.logger.info("Starting backup creation", backup_name=backup_name)
 
         try:
-            # Create temporary file for backup
-            with tempfile.NamedTemporaryFile(suffix=".sql", delete=False) as temp_file:
+            # Plain dumps go straight from pg_dump to providers that can
+            # take a stream, without a local copy
+            if (
+                self.provider.supports_streaming
+                and self.config.backup_format == "plain"
+            ):
+                upload_result = self._stream_backup(backup_name, verify)
+                backup_size = upload_result["size"]
+                duration = time.time() - start_time
+                upload_result["duration"] = duration
+
+                self.logger.info(
+                    "Backup created successfully",
+                    backup_name=backup_name,
+                    size=backup_size,
+                    duration=duration,
+                )
+
+                return upload_result
+
+            # Create temporary file for backup, compressed as it is dumped
+            # when compression is enabled so the SQL never lands on disk uncompressed
+            compress = self.config.compression
+            if self.config.backup_format == "custom":
+                suffix = CUSTOM_DUMP_SUFFIX
+            else:
+                suffix = (
+                    COMPRESSED_SUFFIXES[self.config.compression_algorithm]
+                    if compress
+                    else ".sql"
+                )
+            with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_file:
                 temp_path = temp_file.name
 
-            # Create pg_dump command and environment
-            cmd = self._build_pg_dump_command(temp_path)
-            env = self._get_environment()
-
-            # Execute pg_dump
-            self.logger.info("Executing pg_dump", command=" ".join(cmd))
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.config.backup_timeout,
-                env=env,
-            )
-
-            if result.returncode != 0:
-                raise RuntimeError(f"pg_dump failed: {result.stderr}")
-
-            # Get backup size
-            backup_size = Path(temp_path).stat().st_size
+            # Plain dumps are verified on the byte stream as they are written;
+            # custom-format archives by re-reading their header
+            if self.config.backup_format == "custom":
+                backup_size = self._dump_database_custom(temp_path)
+                if verify:
+                    self._verify_backup(temp_path)
+            else:
+                backup_size = self._dump_database(temp_path, compress, verify)
             self.logger.info("pg_dump completed", size=backup_size)
 
-            # Verify backup if requested
-            if verify:
-                self._verify_backup(temp_path)
-
             # Prepare metadata
             metadata = {
                 "backup_name": backup_name,
@@ -86,8 +138,8 @@ class BackupManager:
                 backup_name, temp_path, metadata
             )
 
-            # Clean up temporary file
-            Path(temp_path).unlink()
+            # Clean up temporary file (providers may have moved it into place)
+            Path(temp_path).unlink(missing_ok=True)
 
             duration = time.time() - start_time
             upload_result["duration"] = duration
@@ -123,22 +175,21 @@ class BackupManager:
             if not self.provider.download_backup(backup_name, temp_path):
                 raise RuntimeError(f"Failed to download backup: {backup_name}")
 
-            # Create psql command for restore
-            cmd = self._build_psql_command(temp_path)
+            # Custom-format dumps are restored by pg_restore in parallel
+            with open(temp_path, "rb") as f:
+                is_custom_format = f.read(len(CUSTOM_DUMP_MAGIC)) == CUSTOM_DUMP_MAGIC
+            if is_custom_format:
+                cmd = self._build_pg_restore_command(temp_path)
+            else:
+                cmd = self._build_psql_command(temp_path)
             env = self._get_environment()
 
             # Execute restore
             self.logger.info("Executing database restore", command=" ".join(cmd))
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=self.config.backup_timeout,
-                env=env,
-            )
+            returncode, error = self._run_pg_command(cmd, env)
 
-            if result.returncode != 0:
-                raise RuntimeError(f"Database restore failed: {result.stderr}")
+            if returncode != 0:
+                raise RuntimeError(f"Database restore failed: {error}")
 
             # Clean up temporary file
             Path(temp_path).unlink()
@@ -183,26 +234,24 @@ class BackupManager:
         )
 
         try:
-            all_backups = self.provider.list_backups()
-            cutoff_date = datetime.now() - timedelta(days=self.config.retention_days)
-
-            old_backups = []
-            for backup in all_backups:
-                try:
-                    backup_date = datetime.fromisoformat(
-                        backup["created"].replace("Z", "+00:00")
-                    )
-                    if backup_date < cutoff_date:
-                        old_backups.append(backup)
-                except (ValueError, KeyError):
-                    # Skip backups with invalid dates
-                    continue
-
-            deleted_count = 0
-            for backup in old_backups:
-                if self.provider.delete_backup(backup["name"]):
-                    deleted_count += 1
-                    self.logger.info("Deleted old backup", backup_name=backup["name"])
+            # The storage service expires backups itself; nothing to walk
+            if (
+                self.config.server_side_retention
+                and self.provider.apply_retention_policy(self.config.retention_days)
+            ):
+                self.logger.info("Backup retention enforced by lifecycle rule")
+                return 0
+
+            # Only the expired backups are collected, not the whole listing
+            old_backups = list(self._iter_expired_backups())
+
+            # Providers batch the deletes where their storage allows it
+            deleted = self.provider.delete_backups(
+                backup["name"] for backup in old_backups
+            )
+            for backup_name in deleted:
+                self.logger.info("Deleted old backup", backup_name=backup_name)
+            deleted_count = len(deleted)
 
             self.logger.info("Backup cleanup completed", deleted_count=deleted_count)
             return deleted_count
@@ -214,20 +263,8 @@ class BackupManager:
     def get_old_backups(self) -> List[Dict[str, Any]]:
         """Get list of old backups that would be cleaned up."""
         try:
-            all_backups = self.provider.list_backups()
-            cutoff_date = datetime.now() - timedelta(days=self.config.retention_days)
-
-            old_backups = []
-            for backup in all_backups:
-                try:
-                    backup_date = datetime.fromisoformat(
-                        backup["created"].replace("Z", "+00:00")
-                    )
-                    if backup_date < cutoff_date:
-                        old_backups.append(backup)
-                except (ValueError, KeyError):
-                    # Skip backups with invalid dates
-                    continue
+            # Only the expired backups are collected, not the whole listing
+            old_backups = list(self._iter_expired_backups())
 
             return old_backups
 
@@ -235,16 +272,41 @@ class BackupManager:
             self.logger.error("Failed to get old backups", error=str(e))
             return []
 
+    def _iter_expired_backups(self) -> Iterator[Dict[str, Any]]:
+        """Yield backups created before the retention cutoff.
+
+        Creation times are compared as epoch seconds, which works for both
+        the naive local times in metadata and the timezone-aware
+        LastModified fallback.
+        """
+        cutoff = (
+            datetime.now() - timedelta(days=self.config.retention_days)
+        ).timestamp()
+
+        for backup in self.provider.iter_backups():
+            try:
+                created = datetime.fromisoformat(
+                    backup["created"].replace("Z", "+00:00")
+                ).timestamp()
+            except (ValueError, KeyError):
+                # Skip backups with invalid dates
+                continue
+            if created < cutoff:
+                yield backup
+
     def get_status(self) -> Dict[str, Any]:
         """Get backup system status."""
         try:
-            backups = self.provider.list_backups()
-            total_size = sum(backup.get("size", 0) for backup in backups)
-
+            # Aggregate in one pass without holding the listing in memory
+            total_backups = 0
+            total_size = 0
             last_backup = None
-            if backups:
-                last_backup = max(backups, key=lambda x: x.get("created", ""))
-                last_backup = last_backup.get("created")
+            for backup in self.provider.iter_backups():
+                total_backups += 1
+                total_size += backup.get("size", 0)
+                created = backup.get("created", "")
+                if last_backup is None or created > last_backup:
+                    last_backup = created
 
             return {
                 "provider": self.config.provider,
@@ -252,7 +314,7 @@ class BackupManager:
                 "schedule": self.config.schedule,
                 "retention_days": self.config.retention_days,
                 "last_backup": last_backup,
-                "total_backups": len(backups),
+                "total_backups": total_backups,
                 "total_size": total_size,
                 "compression": self.config.compression,
                 "encryption": self.config.encryption,
@@ -272,7 +334,183 @@ class BackupManager:
                 "encryption": self.config.encryption,
             }
 
-    def _build_pg_dump_command(self, output_path: str) -> List[str]:
+    def _stream_backup(self, backup_name: str, verify: bool) -> Dict[str, Any]:
+        """Dump the database straight into provider.upload_stream.
+
+        The provider reads from an OS pipe on a worker thread while pg_dump
+        output is (optionally) compressed into the other end. If the dump fails
+        the reader raises at EOF, so no truncated backup is stored.
+        """
+        metadata = {
+            "backup_name": backup_name,
+            "created": datetime.now().isoformat(),
+            "size": None,
+            "status": "completed",
+            "database": self.config.db_name,
+            "compression": self.config.compression,
+            "encryption": self.config.encryption,
+            "provider": self.config.provider,
+        }
+
+        read_fd, write_fd = os.pipe()
+        reader = _DumpStreamReader(os.fdopen(read_fd, "rb"))
+        outcome: Dict[str, Any] = {}
+
+        def upload() -> None:
+            try:
+                outcome["result"] = self.provider.upload_stream(
+                    backup_name, reader, metadata
+                )
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                reader.close()
+
+        uploader = threading.Thread(target=upload, name="backup-upload")
+        uploader.start()
+
+        try:
+            with os.fdopen(write_fd, "wb") as pipe:
+                try:
+                    if self.config.compression:
+                        with compression_writer(pipe, self.config) as sink:
+                            size = self._run_pg_dump(sink, verify)
+                    else:
+                        size = self._run_pg_dump(pipe, verify)
+                except BaseException:
+                    reader.failed.set()
+                    raise
+                # Set before the pipe closes, so it is stored with the upload
+                metadata["size"] = size
+                self.logger.info("pg_dump completed", size=size)
+        except BrokenPipeError:
+            # The upload stopped reading early; its own error is raised below
+            uploader.join()
+            if "error" not in outcome:
+                raise
+        finally:
+            uploader.join()
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    def _dump_database(
+        self, output_path: str, compress: bool, verify: bool = False
+    ) -> int:
+        """Stream pg_dump output into output_path, compressing it if requested.
+
+        Returns the size of the uncompressed dump.
+        """
+        if compress:
+            output = open_compression_writer(output_path, self.config)
+        else:
+            output = open(output_path, "wb")
+
+        with output as sink:
+            return self._run_pg_dump(sink, verify)
+
+    def _run_pg_dump(self, sink: IO[bytes], verify: bool = False) -> int:
+        """Run pg_dump and copy its output into sink.
+
+        With verify, the start of the output is checked for the plain-format
+        dump header. Returns the size of the uncompressed dump.
+        """
+        cmd = self._build_pg_dump_command()
+        env = self._get_environment()
+
+        self.logger.info("Executing pg_dump", command=" ".join(cmd))
+
+        timed_out = threading.Event()
+
+        def kill_on_timeout() -> None:
+            timed_out.set()
+            process.kill()
+
+        # stderr goes to a file: --verbose output could otherwise fill the
+        # pipe and stall pg_dump while stdout is being read
+        with tempfile.TemporaryFile() as stderr:
+            process = subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=stderr, env=env
+            )
+            timer = threading.Timer(self.config.backup_timeout, kill_on_timeout)
+            timer.start()
+
+            size = 0
+            try:
+                while chunk := process.stdout.read(COPY_BUFFER_SIZE):
+                    if verify and size == 0 and not chunk.startswith(DUMP_HEADER):
+                        raise RuntimeError(
+                            "Backup verification failed: output does not appear "
+                            "to be a valid PostgreSQL dump"
+                        )
+                    sink.write(chunk)
+                    size += len(chunk)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+                process.stdout.close()
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+
+            if timed_out.is_set():
+                raise RuntimeError(
+                    f"pg_dump timed out after {self.config.backup_timeout} seconds"
+                )
+
+            if returncode != 0:
+                stderr.seek(0)
+                error = stderr.read().decode("utf-8", errors="replace")
+                raise RuntimeError(f"pg_dump failed: {error}")
+
+        return size
+
+    def _dump_database_custom(self, output_path: str) -> int:
+        """Write a custom-format dump, compressed by pg_dump itself.
+
+        Returns the size of the dump file.
+        """
+        cmd = self._build_pg_dump_command(output_path)
+        env = self._get_environment()
+
+        self.logger.info("Executing pg_dump", command=" ".join(cmd))
+
+        try:
+            returncode, error = self._run_pg_command(cmd, env)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(
+                f"pg_dump timed out after {self.config.backup_timeout} seconds"
+            )
+
+        if returncode != 0:
+            raise RuntimeError(f"pg_dump failed: {error}")
+
+        return Path(output_path).stat().st_size
+
+    def _run_pg_command(self, cmd: List[str], env: Dict[str, str]) -> Tuple[int, str]:
+        """Run a PostgreSQL client command to completion.
+
+        stdout is discarded and stderr (--verbose output, which can run to
+        megabytes) is spooled to a temporary file rather than held in memory;
+        it is only read back when the command fails.
+        Returns the exit status and, on failure, the error output.
+        """
+        with tempfile.TemporaryFile() as stderr:
+            result = subprocess.run(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr,
+                timeout=self.config.backup_timeout,
+                env=env,
+            )
+            if result.returncode == 0:
+                return 0, ""
+
+            stderr.seek(0)
+            return result.returncode, stderr.read().decode("utf-8", errors="replace")
+
+    def _build_pg_dump_command(self, output_path: Optional[str] = None) -> List[str]:
         """Build pg_dump command with SSL and certificate options."""
         cmd = [
             "pg_dump",
@@ -284,38 +522,17 @@ class BackupManager:
             self.config.db_user,
             "--dbname",
             self.config.db_name,
-            "--file",
-            output_path,
             "--verbose",
             "--no-password",
         ]
 
-        # Set password via environment only if password is provided
-        env = os.environ.copy()
-        if self.config.db_password:
-            env["PGPASSWORD"] = self.config.db_password
-
-        # Add SSL options via environment variables
-        if self.config.db_ssl_mode in ["require", "verify-ca", "verify-full", "prefer"]:
-            env["PGSSLMODE"] = self.config.db_ssl_mode
+        # Without --file, pg_dump writes the dump to stdout
+        if output_path:
+            cmd.extend(["--file", output_path])
 
-            # Add certificate paths using centralized config
-            from brownie_metadata_db.certificates import cert_config
-
-            cert_paths = cert_config.get_client_cert_paths()
-            client_cert = cert_paths["client_cert"]
-            client_key = cert_paths["client_key"]
-            ca_cert = cert_paths["ca_cert"]
-
-            if os.path.exists(client_cert) and os.path.exists(client_key):
-                env["PGSSLCERT"] = client_cert
-                env["PGSSLKEY"] = client_key
-
-            if os.path.exists(ca_cert):
-                env["PGSSLROOTCERT"] = ca_cert
-        elif self.config.db_ssl_mode == "disable":
-            # For disable mode, explicitly set SSL mode to disable
-            env["PGSSLMODE"] = "disable"
+        if self.config.backup_format == "custom":
+            level = self.config.compression_level if self.config.compression else 0
+            cmd.extend(["--format", "custom", "--compress", str(level)])
 
         return cmd
 
@@ -366,6 +583,25 @@ class BackupManager:
 
         return cmd
 
+    def _build_pg_restore_command(self, input_path: str) -> List[str]:
+        """Build a parallel pg_restore command for custom-format dumps."""
+        return [
+            "pg_restore",
+            "--host",
+            self.config.db_host,
+            "--port",
+            str(self.config.db_port),
+            "--username",
+            self.config.db_user,
+            "--dbname",
+            self.config.db_name,
+            "--jobs",
+            str(self.config.parallel_jobs),
+            "--verbose",
+            "--no-password",
+            input_path,
+        ]
+
     def _get_environment(self) -> Dict[str, str]:
         """Get environment variables for PostgreSQL commands."""
         env = os.environ.copy()
@@ -407,10 +643,19 @@ class BackupManager:
             if Path(backup_path).stat().st_size == 0:
                 raise RuntimeError("Backup file is empty")
 
-            # Try to read first few lines to check format
-            with open(backup_path, "r") as f:
-                first_line = f.readline().strip()
-                if not first_line.startswith("-- PostgreSQL database dump"):
+            # Custom-format dumps start with a fixed header instead of SQL
+            if backup_path.endswith(CUSTOM_DUMP_SUFFIX):
+                with open(backup_path, "rb") as f:
+                    if f.read(len(CUSTOM_DUMP_MAGIC)) != CUSTOM_DUMP_MAGIC:
+                        raise RuntimeError(
+                            "Backup file does not appear to be a valid pg_dump archive"
+                        )
+                self.logger.info("Backup verification successful")
+                return
+
+            # Read the start of the (decompressed) dump to check format
+            with open_decompressed(backup_path) as f:
+                if not f.read(len(DUMP_HEADER)).startswith(DUMP_HEADER):
                     raise RuntimeError(
                         "Backup file does not appear to be a valid PostgreSQL dump"
                     )
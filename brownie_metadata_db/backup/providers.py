@@ -1,22 +1,175 @@
 """Backup providers for different storage backends."""
 
 import gzip
+import heapq
+import importlib.util
 import json
 import os
+import shutil
+import subprocess
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# Chunk size for streaming backups through compression
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# pg_dump custom-format archives (compressed by pg_dump, restored by pg_restore)
+CUSTOM_DUMP_SUFFIX = ".dump"
+CUSTOM_DUMP_MAGIC = b"PGDMP"
+
+# Extension of compressed plain-format dumps, per compression algorithm
+COMPRESSED_SUFFIXES = {"gzip": ".sql.gz", "zstd": ".sql.zst"}
+
+# File extensions of stored backups (metadata lives in <name>.json)
+BACKUP_SUFFIXES = (*COMPRESSED_SUFFIXES.values(), ".sql", CUSTOM_DUMP_SUFFIX)
+
+
+def _created(backup: Dict[str, Any]) -> str:
+    """Sort key for backups by creation time."""
+    return backup["created"]
+
+
+def _backup_name(filename: str) -> str:
+    """Strip the backup extension from a file or object name."""
+    for suffix in BACKUP_SUFFIXES:
+        if filename.endswith(suffix):
+            return filename[: -len(suffix)]
+    return filename
+
+
+def _stored_suffix(backup_path: str) -> Optional[str]:
+    """Return the extension of a file that is stored as-is, if it has one.
+
+    Dumps compressed while dumping and custom-format archives need no
+    further compression.
+    """
+    for suffix in BACKUP_SUFFIXES:
+        if suffix != ".sql" and backup_path.endswith(suffix):
+            return suffix
+    return None
+
+
+def copy_file(source: str, destination: str) -> None:
+    """Copy a file's contents inside the kernel where possible.
+
+    copy_file_range avoids bouncing data through userspace and lets
+    copy-on-write filesystems share extents instead of copying them.
+    Falls back to shutil.copyfile (sendfile on Linux) when unsupported.
+    """
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None:
+        try:
+            with open(source, "rb") as src, open(destination, "wb") as dst:
+                while copy_file_range(src.fileno(), dst.fileno(), 1 << 30):
+                    pass
+            return
+        except OSError:
+            # e.g. cross-device copies on older kernels; start over below
+            pass
+    shutil.copyfile(source, destination)
+
+
+def _pigz(threads: int) -> Optional[str]:
+    """Return the pigz executable when parallel compression is requested."""
+    return shutil.which("pigz") if threads > 1 else None
+
+
+@contextmanager
+def gzip_writer(output: IO[bytes], level: int, threads: int = 1) -> Iterator[IO[bytes]]:
+    """Wrap a binary file object so writes are gzipped on `threads` cores.
+
+    With more than one thread and pigz on PATH the data is piped through
+    ``pigz -p threads``; otherwise the stdlib single-threaded gzip is used.
+    Both produce standard gzip streams. `output` is left open.
+    """
+    pigz = _pigz(threads)
+    if pigz is None:
+        with gzip.GzipFile(fileobj=output, mode="wb", compresslevel=level) as f:
+            yield f
+        return
+
+    process = subprocess.Popen(
+        [pigz, "-p", str(threads), f"-{level}", "-c"],
+        stdin=subprocess.PIPE,
+        stdout=output,
+    )
+    try:
+        yield process.stdin
+    finally:
+        process.stdin.close()
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"pigz exited with status {returncode}")
+
+
+def _import_zstandard():
+    """Import zstandard, which is only needed for zstd compression."""
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(
+            "zstandard package required for zstd compression. "
+            "Install with: pip install zstandard"
+        )
+    return zstandard
+
+
+@contextmanager
+def zstd_writer(output: IO[bytes], level: int, threads: int = 1) -> Iterator[IO[bytes]]:
+    """Wrap a binary file object so writes are zstd-compressed.
+
+    zstd compresses on `threads` worker threads when more than one is
+    configured. `output` is left open.
+    """
+    zstandard = _import_zstandard()
+    compressor = zstandard.ZstdCompressor(
+        level=level, threads=threads if threads > 1 else 0
+    )
+    with compressor.stream_writer(output, closefd=False) as f:
+        yield f
+
+
+def compression_writer(output: IO[bytes], config) -> Iterator[IO[bytes]]:
+    """Wrap output with the compressor selected by the backup config."""
+    writer = zstd_writer if config.compression_algorithm == "zstd" else gzip_writer
+    return writer(output, config.compression_level, config.compression_threads)
+
+
+@contextmanager
+def open_compression_writer(path: str, config) -> Iterator[IO[bytes]]:
+    """Open path for writing data compressed as the backup config selects."""
+    with open(path, "wb") as output:
+        with compression_writer(output, config) as f:
+            yield f
+
+
+def open_decompressed(path: str) -> IO[bytes]:
+    """Open a backup file for reading, decompressing it by its extension."""
+    if path.endswith(".zst"):
+        zstandard = _import_zstandard()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
 
 class BackupProvider(ABC):
     """Abstract base class for backup providers."""
 
+    # Providers that can upload straight from a pg_dump pipe set this and
+    # implement upload_stream
+    supports_streaming = False
+
     def __init__(self, config):
         self.config = config
         self.logger = logger.bind(provider=self.__class__.__name__)
@@ -28,32 +181,69 @@ class BackupProvider(ABC):
         """Upload backup to storage."""
         pass
 
+    def upload_stream(
+        self, backup_name: str, stream: IO[bytes], metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Upload a backup read from a stream, without a local file.
+
+        The stream is read to EOF before `metadata` is stored, so the caller
+        may fill in fields such as the size while the upload is running.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support streaming uploads"
+        )
+
     @abstractmethod
     def download_backup(self, backup_name: str, destination_path: str) -> bool:
         """Download backup from storage."""
         pass
 
     @abstractmethod
-    def list_backups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """List available backups."""
+    def iter_backups(self) -> Iterator[Dict[str, Any]]:
+        """Yield available backups one at a time, in storage order."""
         pass
 
+    def list_backups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List available backups, newest first."""
+        try:
+            # With a limit only the newest `limit` backups are kept in memory
+            if limit:
+                return heapq.nlargest(limit, self.iter_backups(), key=_created)
+            return sorted(self.iter_backups(), key=_created, reverse=True)
+
+        except Exception as e:
+            self.logger.error("Failed to list backups", error=str(e))
+            return []
+
     @abstractmethod
     def delete_backup(self, backup_name: str) -> bool:
         """Delete backup from storage."""
         pass
 
+    def delete_backups(self, backup_names: Iterable[str]) -> List[str]:
+        """Delete several backups, returning the names that were deleted."""
+        return [name for name in backup_names if self.delete_backup(name)]
+
     @abstractmethod
     def get_backup_info(self, backup_name: str) -> Optional[Dict[str, Any]]:
         """Get backup information."""
         pass
 
+    def apply_retention_policy(self, retention_days: int) -> bool:
+        """Have the storage service expire backups after `retention_days`.
+
+        Returns False when the provider has no server-side expiry, in which
+        case old backups must be deleted by the client.
+        """
+        return False
+
     def compress_backup(self, source_path: str, dest_path: str) -> bool:
         """Compress backup file."""
         try:
+            # Stream in chunks so large dumps are never held in memory
             with open(source_path, "rb") as f_in:
-                with gzip.open(dest_path, "wb") as f_out:
-                    f_out.write(f_in.read())
+                with open_compression_writer(dest_path, self.config) as f_out:
+                    shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
             return True
         except Exception as e:
             self.logger.error("Failed to compress backup", error=str(e))
@@ -62,9 +252,17 @@ class BackupProvider(ABC):
     def decompress_backup(self, source_path: str, dest_path: str) -> bool:
         """Decompress backup file."""
         try:
-            with gzip.open(source_path, "rb") as f_in:
+            pigz = _pigz(self.config.compression_threads)
+            if pigz and source_path.endswith(".gz"):
+                with open(dest_path, "wb") as f_out:
+                    subprocess.run(
+                        [pigz, "-d", "-c", source_path], stdout=f_out, check=True
+                    )
+                return True
+
+            with open_decompressed(source_path) as f_in:
                 with open(dest_path, "wb") as f_out:
-                    f_out.write(f_in.read())
+                    shutil.copyfileobj(f_in, f_out, COPY_BUFFER_SIZE)
             return True
         except Exception as e:
             self.logger.error("Failed to decompress backup", error=str(e))
@@ -87,18 +285,24 @@ class LocalProvider(BackupProvider):
             source_path = Path(backup_path)
             dest_path = self.backup_dir / f"{backup_name}.sql"
 
-            if self.config.compression:
-                compressed_path = self.backup_dir / f"{backup_name}.sql.gz"
-                if self.compress_backup(backup_path, str(compressed_path)):
-                    dest_path = compressed_path
-                else:
-                    # Fallback to uncompressed
-                    dest_path = self.backup_dir / f"{backup_name}.sql"
-
-            # Copy file
-            import shutil
+            # Compressed while dumping (or a custom-format archive, which
+            # pg_dump compresses itself); move it into place as-is
+            suffix = _stored_suffix(backup_path)
+            if suffix:
+                dest_path = self.backup_dir / f"{backup_name}{suffix}"
+                shutil.move(backup_path, str(dest_path), copy_function=copy_file)
+            else:
+                compressed = False
+                if self.config.compression:
+                    suffix = COMPRESSED_SUFFIXES[self.config.compression_algorithm]
+                    compressed_path = self.backup_dir / f"{backup_name}{suffix}"
+                    if self.compress_backup(backup_path, str(compressed_path)):
+                        dest_path = compressed_path
+                        compressed = True
 
-            shutil.copy2(backup_path, str(dest_path))
+                # Copy file, unless it was already written compressed
+                if not compressed:
+                    copy_file(backup_path, str(dest_path))
 
             # Save metadata
             metadata_path = self.backup_dir / f"{backup_name}.json"
@@ -130,91 +334,73 @@ class LocalProvider(BackupProvider):
         """Download backup from local filesystem."""
         try:
             # Try compressed first, then uncompressed
-            compressed_path = self.backup_dir / f"{backup_name}.sql.gz"
-            uncompressed_path = self.backup_dir / f"{backup_name}.sql"
+            for suffix in BACKUP_SUFFIXES:
+                backup_path = self.backup_dir / f"{backup_name}{suffix}"
+                if not backup_path.exists():
+                    continue
 
-            if compressed_path.exists():
-                if self.config.compression:
-                    return self.decompress_backup(
-                        str(compressed_path), destination_path
-                    )
-                else:
+                if suffix in COMPRESSED_SUFFIXES.values():
                     # Decompress to destination
-                    return self.decompress_backup(
-                        str(compressed_path), destination_path
-                    )
-            elif uncompressed_path.exists():
-                import shutil
+                    return self.decompress_backup(str(backup_path), destination_path)
 
-                shutil.copy2(str(uncompressed_path), destination_path)
+                copy_file(str(backup_path), destination_path)
                 return True
-            else:
-                self.logger.error("Backup not found", backup_name=backup_name)
-                return False
+
+            self.logger.error("Backup not found", backup_name=backup_name)
+            return False
 
         except Exception as e:
             self.logger.error("Failed to download backup", error=str(e))
             return False
 
-    def list_backups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """List available backups."""
-        try:
-            backups = []
-
-            for file_path in self.backup_dir.glob("*.sql*"):
-                if file_path.suffix == ".json":
+    def iter_backups(self) -> Iterator[Dict[str, Any]]:
+        """Yield backups from the local filesystem."""
+        # One directory scan, filtered with a single suffix-tuple check
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(BACKUP_SUFFIXES):
                     continue
 
-                backup_name = file_path.stem
-                if backup_name.endswith(".sql"):
-                    backup_name = backup_name[:-4]  # Remove .sql suffix
-
-                # Load metadata
-                metadata_path = self.backup_dir / f"{backup_name}.json"
-                metadata = {}
-                if metadata_path.exists():
-                    with open(metadata_path, "r") as f:
-                        metadata = json.load(f)
-
-                backup_info = {
-                    "name": backup_name,
-                    "size": file_path.stat().st_size,
-                    "created": metadata.get(
-                        "created",
-                        datetime.fromtimestamp(file_path.stat().st_mtime).isoformat(),
-                    ),
-                    "status": metadata.get("status", "unknown"),
-                    "path": str(file_path),
-                }
-                backups.append(backup_info)
-
-            # Sort by creation time (newest first)
-            backups.sort(key=lambda x: x["created"], reverse=True)
-
-            if limit:
-                backups = backups[:limit]
+                yield self._backup_entry(entry)
 
-            return backups
+    def _backup_entry(self, entry: os.DirEntry) -> Dict[str, Any]:
+        """Describe one backup file found by iter_backups."""
+        file_path = Path(entry.path)
+        backup_name = _backup_name(entry.name)
 
-        except Exception as e:
-            self.logger.error("Failed to list backups", error=str(e))
-            return []
+        # Load metadata
+        metadata = {}
+        try:
+            with open(self.backup_dir / f"{backup_name}.json", "r") as f:
+                metadata = json.load(f)
+        except FileNotFoundError:
+            pass
+
+        # One stat per file; the mtime is only formatted without metadata
+        stat = entry.stat()
+        created = metadata.get("created")
+        if created is None:
+            created = datetime.fromtimestamp(stat.st_mtime).isoformat()
+
+        return {
+            "name": backup_name,
+            "size": stat.st_size,
+            "created": created,
+            "status": metadata.get("status", "unknown"),
+            "path": str(file_path),
+        }
 
     def delete_backup(self, backup_name: str) -> bool:
         """Delete backup from local filesystem."""
         try:
-            # Try compressed first, then uncompressed
-            compressed_path = self.backup_dir / f"{backup_name}.sql.gz"
-            uncompressed_path = self.backup_dir / f"{backup_name}.sql"
             metadata_path = self.backup_dir / f"{backup_name}.json"
 
             deleted = False
-            if compressed_path.exists():
-                compressed_path.unlink()
-                deleted = True
-            if uncompressed_path.exists():
-                uncompressed_path.unlink()
-                deleted = True
+            for suffix in BACKUP_SUFFIXES:
+                backup_path = self.backup_dir / f"{backup_name}{suffix}"
+                if backup_path.exists():
+                    backup_path.unlink()
+                    deleted = True
             if metadata_path.exists():
                 metadata_path.unlink()
 
@@ -246,24 +432,73 @@ class LocalProvider(BackupProvider):
             return None
 
 
+# botocore's default connection pool size
+S3_MIN_POOL_CONNECTIONS = 10
+
+# ID of the bucket lifecycle rule that expires backups under our prefix
+S3_RETENTION_RULE_ID = "brownie-backup-retention"
+
+# delete_objects accepts at most this many keys per request
+S3_DELETE_BATCH_SIZE = 1000
+
+# Multipart transfer settings: backups above the threshold are sent as
+# concurrent 64 MiB parts instead of one serial stream
+S3_MULTIPART_CHUNK_SIZE = 64 * 1024 * 1024
+S3_TRANSFER_CONCURRENCY = 16
+
+# Checksum sent with every upload (per part for multipart uploads) and
+# verified by S3 before it accepts the object
+S3_UPLOAD_ARGS = {"ChecksumAlgorithm": "CRC32"}
+
+
+@lru_cache(maxsize=None)
+def _get_s3_client(
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    region: Optional[str],
+    max_pool_connections: int,
+):
+    """Create one S3 client per credential set, reused by every S3Provider.
+
+    boto3 clients are thread-safe, so managers built for separate commands
+    share credential resolution and keep-alive connections.
+    """
+    import boto3
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region,
+        config=Config(max_pool_connections=max_pool_connections, tcp_keepalive=True),
+    )
+
+
 class S3Provider(BackupProvider):
     """AWS S3 backup provider."""
 
+    supports_streaming = True
+
     def __init__(self, config):
         super().__init__(config)
         try:
-            import boto3
+            # boto3 itself is imported on first use (see s3_client); only
+            # check it is installed here
+            if importlib.util.find_spec("boto3") is None:
+                raise ImportError("boto3")
             from botocore.exceptions import ClientError
 
-            self.boto3 = boto3
             self.ClientError = ClientError
 
-            # Initialize S3 client
-            self.s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=config.access_key,
-                aws_secret_access_key=config.secret_key,
-                region_name=config.region,
+            # Retention days of the lifecycle rule already applied, if any
+            self._retention_days: Optional[int] = None
+
+            # Connection pool size of the shared client, see s3_client
+            self.pool_connections = max(
+                S3_MIN_POOL_CONNECTIONS,
+                S3_TRANSFER_CONCURRENCY,
+                config.parallel_jobs * 4,
             )
 
             # Parse bucket and prefix from destination
@@ -273,6 +508,9 @@ class S3Provider(BackupProvider):
                 self.bucket_name = config.destination
                 self.prefix = ""
 
+            # Prepended to every object key, computed once
+            self.key_prefix = f"{self.prefix}/" if self.prefix else ""
+
         except ImportError:
             raise RuntimeError(
                 "boto3 package required for S3 provider. Install with: pip install boto3"
@@ -280,6 +518,32 @@ class S3Provider(BackupProvider):
         except Exception as e:
             raise RuntimeError(f"Failed to initialize S3 provider: {e}")
 
+    @cached_property
+    def s3_client(self):
+        """Shared S3 client (and its connection pool) for these credentials.
+
+        Built on first use, so commands that never reach S3 skip the cost
+        of loading botocore's service model.
+        """
+        return _get_s3_client(
+            self.config.access_key,
+            self.config.secret_key,
+            self.config.region,
+            self.pool_connections,
+        )
+
+    @cached_property
+    def transfer_config(self):
+        """Multipart settings for uploads and downloads."""
+        from boto3.s3.transfer import TransferConfig
+
+        return TransferConfig(
+            multipart_threshold=S3_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=S3_MULTIPART_CHUNK_SIZE,
+            max_concurrency=S3_TRANSFER_CONCURRENCY,
+            use_threads=True,
+        )
+
     def upload_backup(
         self, backup_name: str, backup_path: str, metadata: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -288,31 +552,36 @@ class S3Provider(BackupProvider):
             source_path = Path(backup_path)
 
             # Determine file extension
-            file_extension = ".sql.gz" if self.config.compression else ".sql"
-            s3_key = (
-                f"{self.prefix}/{backup_name}{file_extension}"
-                if self.prefix
-                else f"{backup_name}{file_extension}"
-            )
-
-            # Compress if needed
-            if self.config.compression and not backup_path.endswith(".gz"):
-                compressed_path = f"{backup_path}.gz"
-                if not self.compress_backup(backup_path, compressed_path):
-                    raise RuntimeError("Failed to compress backup")
-                upload_path = compressed_path
-            else:
-                upload_path = backup_path
+            file_extension = _stored_suffix(backup_path)
+            upload_path = backup_path
+            if file_extension is None:
+                if self.config.compression:
+                    file_extension = COMPRESSED_SUFFIXES[
+                        self.config.compression_algorithm
+                    ]
+                    # Compress to a temporary file next to the dump
+                    upload_path = str(source_path.with_suffix(file_extension))
+                    if not self.compress_backup(backup_path, upload_path):
+                        raise RuntimeError("Failed to compress backup")
+                else:
+                    file_extension = ".sql"
+            s3_key = f"{self.key_prefix}{backup_name}{file_extension}"
 
             # Upload to S3
-            self.s3_client.upload_file(upload_path, self.bucket_name, s3_key)
+            try:
+                self.s3_client.upload_file(
+                    upload_path,
+                    self.bucket_name,
+                    s3_key,
+                    ExtraArgs=S3_UPLOAD_ARGS,
+                    Config=self.transfer_config,
+                )
+            finally:
+                if upload_path != backup_path:
+                    Path(upload_path).unlink(missing_ok=True)
 
             # Upload metadata
-            metadata_key = (
-                f"{self.prefix}/{backup_name}.json"
-                if self.prefix
-                else f"{backup_name}.json"
-            )
+            metadata_key = f"{self.key_prefix}{backup_name}.json"
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=metadata_key,
@@ -344,47 +613,98 @@ class S3Provider(BackupProvider):
             self.logger.error("Failed to upload backup to S3", error=str(e))
             raise
 
-    def download_backup(self, backup_name: str, destination_path: str) -> bool:
-        """Download backup from S3."""
+    def upload_stream(
+        self, backup_name: str, stream: IO[bytes], metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Upload a backup to S3 from a stream, using multipart upload."""
         try:
-            # Try compressed first, then uncompressed
-            compressed_key = (
-                f"{self.prefix}/{backup_name}.sql.gz"
-                if self.prefix
-                else f"{backup_name}.sql.gz"
+            if self.config.compression:
+                file_extension = COMPRESSED_SUFFIXES[self.config.compression_algorithm]
+            else:
+                file_extension = ".sql"
+            s3_key = f"{self.key_prefix}{backup_name}{file_extension}"
+
+            # Parts are buffered in memory, so nothing is written locally
+            self.s3_client.upload_fileobj(
+                stream,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=S3_UPLOAD_ARGS,
+                Config=self.transfer_config,
             )
-            uncompressed_key = (
-                f"{self.prefix}/{backup_name}.sql"
-                if self.prefix
-                else f"{backup_name}.sql"
+
+            # Upload metadata
+            metadata_key = f"{self.key_prefix}{backup_name}.json"
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=metadata_key,
+                Body=json.dumps(metadata, indent=2),
+                ContentType="application/json",
             )
 
-            # Determine which key exists
-            s3_key = None
-            try:
-                self.s3_client.head_object(Bucket=self.bucket_name, Key=compressed_key)
-                s3_key = compressed_key
-            except self.ClientError:
+            # Get file size
+            response = self.s3_client.head_object(Bucket=self.bucket_name, Key=s3_key)
+            file_size = response["ContentLength"]
+
+            self.logger.info(
+                "Backup streamed to S3 successfully",
+                backup_name=backup_name,
+                size=file_size,
+                bucket=self.bucket_name,
+                key=s3_key,
+            )
+
+            return {
+                "backup_name": backup_name,
+                "path": f"s3://{self.bucket_name}/{s3_key}",
+                "size": file_size,
+                "created": datetime.now().isoformat(),
+                "status": "completed",
+            }
+
+        except Exception as e:
+            self.logger.error("Failed to stream backup to S3", error=str(e))
+            raise
+
+    def download_backup(self, backup_name: str, destination_path: str) -> bool:
+        """Download backup from S3."""
+        try:
+            # Try compressed first, then uncompressed; determine which key exists
+            s3_key = suffix = None
+            for suffix in BACKUP_SUFFIXES:
+                key = f"{self.key_prefix}{backup_name}{suffix}"
                 try:
-                    self.s3_client.head_object(
-                        Bucket=self.bucket_name, Key=uncompressed_key
-                    )
-                    s3_key = uncompressed_key
+                    self.s3_client.head_object(Bucket=self.bucket_name, Key=key)
+                    s3_key = key
+                    break
                 except self.ClientError:
-                    self.logger.error("Backup not found in S3", backup_name=backup_name)
-                    return False
-
-            # Download file
-            self.s3_client.download_file(self.bucket_name, s3_key, destination_path)
+                    continue
 
-            # Decompress if needed
-            if s3_key.endswith(".gz") and self.config.compression:
-                decompressed_path = destination_path.replace(".gz", "")
-                if self.decompress_backup(destination_path, decompressed_path):
-                    # Replace compressed with decompressed
-                    import shutil
+            if s3_key is None:
+                self.logger.error("Backup not found in S3", backup_name=backup_name)
+                return False
 
-                    shutil.move(decompressed_path, destination_path)
+            if suffix in COMPRESSED_SUFFIXES.values():
+                # Download next to the destination, then decompress into it
+                compressed_path = f"{destination_path}{suffix}"
+                try:
+                    self.s3_client.download_file(
+                        self.bucket_name,
+                        s3_key,
+                        compressed_path,
+                        Config=self.transfer_config,
+                    )
+                    if not self.decompress_backup(compressed_path, destination_path):
+                        return False
+                finally:
+                    Path(compressed_path).unlink(missing_ok=True)
+            else:
+                self.s3_client.download_file(
+                    self.bucket_name,
+                    s3_key,
+                    destination_path,
+                    Config=self.transfer_config,
+                )
 
             self.logger.info(
                 "Backup downloaded from S3 successfully",
@@ -397,100 +717,76 @@ class S3Provider(BackupProvider):
             self.logger.error("Failed to download backup from S3", error=str(e))
             return False
 
-    def list_backups(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """List available backups from S3."""
-        try:
-            backups = []
-
-            # List objects with prefix
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            page_iterator = paginator.paginate(
-                Bucket=self.bucket_name, Prefix=self.prefix + "/" if self.prefix else ""
-            )
+    def iter_backups(self) -> Iterator[Dict[str, Any]]:
+        """Yield backups from S3, one listing page at a time."""
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        page_iterator = paginator.paginate(
+            Bucket=self.bucket_name, Prefix=self.key_prefix
+        )
 
+        # Each page's metadata files are fetched concurrently over the
+        # client's connection pool instead of one round trip at a time
+        with ThreadPoolExecutor(max_workers=self.pool_connections) as executor:
             for page in page_iterator:
                 if "Contents" not in page:
                     continue
 
+                objects = []
                 for obj in page["Contents"]:
                     key = obj["Key"]
 
-                    # Skip metadata files
-                    if key.endswith(".json"):
+                    # Skip metadata files and anything else that is not a
+                    # backup (uploads in progress, unrelated objects)
+                    if not key.endswith(BACKUP_SUFFIXES):
                         continue
 
                     # Extract backup name
-                    backup_name = Path(key).stem
-                    if backup_name.endswith(".sql"):
-                        backup_name = backup_name[:-4]
-
-                    # Get metadata
-                    metadata_key = (
-                        f"{self.prefix}/{backup_name}.json"
-                        if self.prefix
-                        else f"{backup_name}.json"
-                    )
-                    metadata = {}
-                    try:
-                        response = self.s3_client.get_object(
-                            Bucket=self.bucket_name, Key=metadata_key
-                        )
-                        metadata = json.loads(response["Body"].read().decode("utf-8"))
-                    except self.ClientError:
-                        # No metadata, use object info
-                        pass
-
-                    backup_info = {
+                    backup_name = _backup_name(key.rpartition("/")[2])
+
+                    objects.append((backup_name, obj))
+
+                metadatas = executor.map(
+                    self._read_metadata, [name for name, _ in objects]
+                )
+                for (backup_name, obj), metadata in zip(objects, metadatas):
+                    created = metadata.get("created")
+                    if created is None:
+                        created = obj["LastModified"].isoformat()
+
+                    yield {
                         "name": backup_name,
                         "size": obj["Size"],
-                        "created": metadata.get(
-                            "created", obj["LastModified"].isoformat()
-                        ),
+                        "created": created,
                         "status": metadata.get("status", "unknown"),
-                        "path": f"s3://{self.bucket_name}/{key}",
+                        "path": f"s3://{self.bucket_name}/{obj['Key']}",
                     }
-                    backups.append(backup_info)
-
-            # Sort by creation time (newest first)
-            backups.sort(key=lambda x: x["created"], reverse=True)
 
-            if limit:
-                backups = backups[:limit]
-
-            return backups
-
-        except Exception as e:
-            self.logger.error("Failed to list backups from S3", error=str(e))
-            return []
+    def _read_metadata(self, backup_name: str) -> Dict[str, Any]:
+        """Read a backup's metadata file, or an empty dict if it has none."""
+        metadata_key = f"{self.key_prefix}{backup_name}.json"
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name, Key=metadata_key
+            )
+        except self.ClientError:
+            # No metadata, use object info
+            return {}
+        return json.loads(response["Body"].read().decode("utf-8"))
 
     def delete_backup(self, backup_name: str) -> bool:
         """Delete backup from S3."""
         try:
-            # Try compressed first, then uncompressed
-            compressed_key = (
-                f"{self.prefix}/{backup_name}.sql.gz"
-                if self.prefix
-                else f"{backup_name}.sql.gz"
-            )
-            uncompressed_key = (
-                f"{self.prefix}/{backup_name}.sql"
-                if self.prefix
-                else f"{backup_name}.sql"
-            )
-            metadata_key = (
-                f"{self.prefix}/{backup_name}.json"
-                if self.prefix
-                else f"{backup_name}.json"
-            )
+            metadata_key = f"{self.key_prefix}{backup_name}.json"
 
             deleted = False
 
-            # Delete backup file
-            for key in [compressed_key, uncompressed_key]:
+            # Delete backup file; delete_object succeeds for missing keys, so
+            # every variant is removed rather than stopping at the first
+            for suffix in BACKUP_SUFFIXES:
+                key = f"{self.key_prefix}{backup_name}{suffix}"
                 try:
                     self.s3_client.delete_object(Bucket=self.bucket_name, Key=key)
                     deleted = True
-                    break
                 except self.ClientError:
                     continue
 
@@ -515,14 +811,106 @@ class S3Provider(BackupProvider):
             self.logger.error("Failed to delete backup from S3", error=str(e))
             return False
 
+    def delete_backups(self, backup_names: Iterable[str]) -> List[str]:
+        """Delete several backups from S3 with batched delete_objects calls."""
+        keys = {}
+        for backup_name in backup_names:
+            for extension in (*BACKUP_SUFFIXES, ".json"):
+                key = f"{self.key_prefix}{backup_name}{extension}"
+                keys[key] = backup_name
+
+        # Batches are independent, so they are sent concurrently over the
+        # client's connection pool
+        key_list = list(keys)
+        batches = [
+            key_list[start : start + S3_DELETE_BATCH_SIZE]
+            for start in range(0, len(key_list), S3_DELETE_BATCH_SIZE)
+        ]
+        with ThreadPoolExecutor(max_workers=self.pool_connections) as executor:
+            failed = {
+                keys.get(key)
+                for failed_keys in executor.map(self._delete_key_batch, batches)
+                for key in failed_keys
+            }
+
+        deleted = [name for name in dict.fromkeys(keys.values()) if name not in failed]
+        self.logger.info("Backups deleted from S3", count=len(deleted))
+        return deleted
+
+    def apply_retention_policy(self, retention_days: int) -> bool:
+        """Expire backups under the prefix with a bucket lifecycle rule.
+
+        The bucket's other lifecycle rules are kept; only our rule is added
+        or replaced. The rule is written once per provider and days value.
+        """
+        if self._retention_days == retention_days:
+            return True
+
+        try:
+            response = self.s3_client.get_bucket_lifecycle_configuration(
+                Bucket=self.bucket_name
+            )
+            rules = response.get("Rules", [])
+        except self.ClientError as e:
+            # A bucket without lifecycle rules reports an error, not []
+            error_code = e.response.get("Error", {}).get("Code")
+            if error_code != "NoSuchLifecycleConfiguration":
+                self.logger.error("Failed to read bucket lifecycle", error=str(e))
+                return False
+            rules = []
+
+        rules = [rule for rule in rules if rule.get("ID") != S3_RETENTION_RULE_ID]
+        rules.append(
+            {
+                "ID": S3_RETENTION_RULE_ID,
+                "Filter": {"Prefix": self.key_prefix},
+                "Status": "Enabled",
+                "Expiration": {"Days": retention_days},
+            }
+        )
+
+        try:
+            self.s3_client.put_bucket_lifecycle_configuration(
+                Bucket=self.bucket_name, LifecycleConfiguration={"Rules": rules}
+            )
+        except self.ClientError as e:
+            self.logger.error("Failed to set bucket lifecycle", error=str(e))
+            return False
+
+        self._retention_days = retention_days
+        self.logger.info(
+            "Backup retention lifecycle rule applied",
+            bucket=self.bucket_name,
+            retention_days=retention_days,
+        )
+        return True
+
+    def _delete_key_batch(self, batch: List[str]) -> List[str]:
+        """Delete one batch of keys, returning the keys that failed."""
+        try:
+            # Quiet mode only reports the keys that could not be deleted
+            response = self.s3_client.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+            )
+        except Exception as e:
+            self.logger.error("Failed to delete backups from S3", error=str(e))
+            return batch
+
+        failed = []
+        for error in response.get("Errors", []):
+            self.logger.warning(
+                "Failed to delete S3 object",
+                key=error.get("Key"),
+                error=error.get("Message"),
+            )
+            failed.append(error.get("Key"))
+        return failed
+
     def get_backup_info(self, backup_name: str) -> Optional[Dict[str, Any]]:
         """Get backup information from S3."""
         try:
-            metadata_key = (
-                f"{self.prefix}/{backup_name}.json"
-                if self.prefix
-                else f"{backup_name}.json"
-            )
+            metadata_key = f"{self.key_prefix}{backup_name}.json"
             response = self.s3_client.get_object(
                 Bucket=self.bucket_name, Key=metadata_key
             )
@@ -4,18 +4,12 @@
 import os
 import signal
 import sys
-import time
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from typing import Optional
 
 import structlog
-
-try:
-    from croniter import croniter
-
-    CRONITER_AVAILABLE = True
-except ImportError:
-    CRONITER_AVAILABLE = False
+from croniter import croniter
 
 from brownie_metadata_db.backup.config import BackupConfig
 from brownie_metadata_db.backup.manager import BackupManager
@@ -26,60 +20,54 @@ logger = structlog.get_logger(__name__)
 class BackupScheduler:
     """Scheduler for automated backup execution."""
 
+    __slots__ = (
+        "config",
+        "manager",
+        "logger",
+        "running",
+        "_wake",
+        "cron_iter",
+        "next_backup",
+    )
+
     def __init__(self, config: BackupConfig):
         self.config = config
         self.manager = BackupManager(config)
         self.logger = logger.bind(scheduler="BackupScheduler")
         self.running = False
+        # Set by stop() to wake the scheduler loop immediately
+        self._wake = threading.Event()
 
-        # Initialize cron iterator
-        if CRONITER_AVAILABLE:
-            self.cron_iter = croniter(config.schedule, datetime.now())
-            self.logger.info(
-                "Using croniter for schedule parsing", schedule=config.schedule
-            )
-        else:
-            self.schedule_parts = self._parse_cron_schedule(config.schedule)
-            self.logger.warning(
-                "croniter not available, using simple schedule parsing",
-                schedule=config.schedule,
-            )
+        if not croniter.is_valid(config.schedule):
+            raise ValueError(f"Invalid cron schedule format: {config.schedule}")
 
-    def _parse_cron_schedule(self, schedule: str) -> dict:
-        """Parse cron schedule into parts."""
-        parts = schedule.split()
-        if len(parts) != 5:
-            raise ValueError(f"Invalid cron schedule format: {schedule}")
-
-        return {
-            "minute": parts[0],
-            "hour": parts[1],
-            "day": parts[2],
-            "month": parts[3],
-            "weekday": parts[4],
-        }
+        # Parsed once; next_backup only advances after it has fired
+        self.cron_iter = croniter(config.schedule, datetime.now())
+        self.next_backup = self.cron_iter.get_next(datetime)
+        self.logger.info(
+            "Backup schedule parsed",
+            schedule=config.schedule,
+            next_backup=self.next_backup.isoformat(),
+        )
 
     def _should_run_backup(self, now: datetime) -> bool:
         """Check if backup should run at the current time."""
-        if CRONITER_AVAILABLE:
-            # Use croniter for accurate cron parsing
-            return self.cron_iter.get_next(datetime) <= now
-        else:
-            # Simple implementation - check if current time matches schedule
-            if (
-                self.schedule_parts["minute"] != "*"
-                and str(now.minute) != self.schedule_parts["minute"]
-            ):
-                return False
-
-            if (
-                self.schedule_parts["hour"] != "*"
-                and str(now.hour) != self.schedule_parts["hour"]
-            ):
-                return False
-
-            # For simplicity, assume daily backups (day=*, month=*, weekday=*)
-            return True
+        # Compare against the precomputed fire time instead of advancing
+        # the iterator on every check
+        if self.next_backup > now:
+            return False
+
+        while self.next_backup <= now:
+            self.next_backup = self.cron_iter.get_next(datetime)
+        return True
+
+    def _seconds_until_next_check(self, now: datetime) -> float:
+        """Seconds to wait until the next backup or daily cleanup is due."""
+        next_cleanup = datetime.combine(
+            now.date() + timedelta(days=1), datetime.min.time()
+        )
+        deadline = min(self.next_backup, next_cleanup)
+        return max(0.0, min((deadline - now).total_seconds(), 3600.0))
 
     def run_backup(self) -> bool:
         """Run a single backup."""
@@ -118,46 +106,44 @@ class BackupScheduler:
     def start(self) -> None:
         """Start the scheduler."""
         self.running = True
+        self._wake.clear()
         self.logger.info("Starting backup scheduler", schedule=self.config.schedule)
 
         # Set up signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
-        last_backup_hour = -1
         last_cleanup_day = -1
 
         while self.running:
             try:
                 now = datetime.now()
 
-                # Check if we should run backup
+                # next_backup advances once it fires, so each slot runs once
                 if self._should_run_backup(now):
-                    # Only run backup once per hour to avoid duplicates
-                    if now.hour != last_backup_hour:
-                        self.run_backup()
-                        last_backup_hour = now.hour
+                    self.run_backup()
 
                 # Run cleanup once per day
                 if now.day != last_cleanup_day:
                     self.run_cleanup()
                     last_cleanup_day = now.day
 
-                # Sleep for 1 minute before checking again
-                time.sleep(60)
+                # Block until the next deadline; stop() wakes us early
+                self._wake.wait(timeout=self._seconds_until_next_check(now))
 
             except KeyboardInterrupt:
                 self.logger.info("Received interrupt signal, shutting down")
                 break
             except Exception as e:
                 self.logger.error("Scheduler error", error=str(e))
-                time.sleep(60)  # Wait before retrying
+                self._wake.wait(timeout=60)  # Wait before retrying
 
         self.logger.info("Backup scheduler stopped")
 
     def stop(self) -> None:
         """Stop the scheduler."""
         self.running = False
+        self._wake.set()
 
     def _signal_handler(self, signum: int, frame) -> None:
         """Handle shutdown signals."""
@@ -168,10 +154,9 @@ class BackupScheduler:
 def main() -> int:
     """Main entry point for the scheduler."""
     # Configure centralized logging
-    from ..logging.config import LoggingConfig, configure_logging
+    from ..logging.config import configure_logging
 
-    logging_config = LoggingConfig()
-    configure_logging(logging_config)
+    configure_logging()
 
     try:
         backup_config = BackupConfig()
@@ -1,6 +1,13 @@
 """Certificate management package for PostgreSQL SSL connections."""
 
 from .config import CertificateConfig, cert_config
+from .server import ServerCertificateManager, get_server_cert_manager
 from .validation import CertificateValidator
 
-__all__ = ["CertificateValidator", "CertificateConfig", "cert_config"]
+__all__ = [
+    "CertificateValidator",
+    "CertificateConfig",
+    "ServerCertificateManager",
+    "cert_config",
+    "get_server_cert_manager",
+]
@@ -0,0 +1,269 @@
+"""
+Server-side certificate management for PostgreSQL.
+
+Manages CA and server certificates for PostgreSQL SSL/TLS configuration.
+Client certificates are handled by the FastAPI application.
+"""
+
+import base64
+import binascii
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Directory PostgreSQL reads the certificates written from Vault from
+SERVER_CERT_DIR = Path("/tmp/brownie-server-certs")
+
+
+class ServerCertificateManager:
+    """Manages PostgreSQL server certificates from Vault or local files."""
+
+    __slots__ = (
+        "vault_enabled",
+        "vault_url",
+        "vault_token",
+        "vault_path",
+        "vault_cache_ttl",
+        "local_cert_dir",
+        "_vault_client",
+        "_cert_cache",
+        "_cert_cache_expires",
+        "_ssl_config",
+        "_written_hash",
+    )
+
+    def __init__(self) -> None:
+        self.vault_enabled = os.getenv("VAULT_ENABLED", "false").lower() == "true"
+        self.vault_url = os.getenv("VAULT_URL")
+        self.vault_token = os.getenv("VAULT_TOKEN")
+        self.vault_path = os.getenv("VAULT_CERT_PATH", "secret/brownie-metadata/certs")
+        self.vault_cache_ttl = float(os.getenv("VAULT_CERT_CACHE_TTL", "300"))
+
+        # Shared Vault client and the decoded certificates from its last read
+        self._vault_client = None
+        self._cert_cache: Dict[str, str] = {}
+        self._cert_cache_expires = 0.0
+
+        # Assembled SSL config and the hash of the certificates last written
+        self._ssl_config: Optional[Dict[str, Any]] = None
+        self._written_hash: Optional[str] = None
+
+        # Local certificate paths (for development)
+        self.local_cert_dir = os.getenv("LOCAL_CERT_DIR", "dev-certs")
+
+    def get_certificate(self, cert_type: str) -> Optional[str]:
+        """
+        Get certificate content from Vault or local file.
+
+        Args:
+            cert_type: Type of certificate (server_cert, server_key, ca_cert)
+
+        Returns:
+            Certificate content as string, or None if not found
+        """
+        if self.vault_enabled:
+            return self._get_from_vault(cert_type)
+        else:
+            return self._get_from_local_file(cert_type)
+
+    def _get_from_vault(self, cert_type: str) -> Optional[str]:
+        """Get certificate from HashiCorp Vault, reusing recent reads."""
+        if time.monotonic() >= self._cert_cache_expires:
+            self._refresh_vault_cache()
+
+        return self._cert_cache.get(cert_type)
+
+    def _refresh_vault_cache(self) -> None:
+        """Read all certificates from Vault in a single request."""
+        try:
+            import hvac
+
+            if self._vault_client is None:
+                self._vault_client = hvac.Client(
+                    url=self.vault_url, token=self.vault_token
+                )
+
+            # Read secret from Vault
+            secret_response = self._vault_client.secrets.kv.v2.read_secret_version(
+                path=self.vault_path
+            )
+            secret_data = secret_response["data"]["data"]
+
+        except ImportError:
+            raise RuntimeError(
+                "hvac package required for Vault integration. Install with: pip install hvac"
+            )
+        except Exception as e:
+            self.invalidate()
+            raise RuntimeError(f"Failed to get certificate from Vault: {e}")
+
+        # Vault returns every certificate together, so cache them all at once
+        self._cert_cache = {
+            cert_type: self._decode_certificate(content)
+            for cert_type, content in secret_data.items()
+            if content
+        }
+        self._cert_cache_expires = time.monotonic() + self.vault_cache_ttl
+
+    @staticmethod
+    def _decode_certificate(cert_content: str) -> str:
+        """Decode certificate content if it is base64 encoded."""
+        # PEM and non-ASCII content cannot be base64; skip the decode attempt
+        if cert_content.startswith("-----") or not cert_content.isascii():
+            return cert_content
+
+        try:
+            # validate=True rejects newlines, so drop line wrapping first
+            encoded = "".join(cert_content.split())
+            return base64.b64decode(encoded, validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            return cert_content
+
+    def invalidate(self) -> None:
+        """Drop cached certificates and SSL config, e.g. after a rotation."""
+        self._vault_client = None
+        self._cert_cache = {}
+        self._cert_cache_expires = 0.0
+        self._ssl_config = None
+
+    def _get_from_local_file(self, cert_type: str) -> Optional[str]:
+        """Get certificate from local file."""
+        cert_file_map = {
+            "server_cert": "server.crt",
+            "server_key": "server.key",
+            "ca_cert": "ca.crt",
+        }
+
+        filename = cert_file_map.get(cert_type)
+        if not filename:
+            return None
+
+        cert_path = Path(self.local_cert_dir) / filename
+
+        if cert_path.exists():
+            return cert_path.read_text()
+
+        return None
+
+    def get_postgres_ssl_config(self) -> Dict[str, Any]:
+        """
+        Get SSL configuration for PostgreSQL server.
+
+        Returns:
+            Dictionary with PostgreSQL SSL configuration parameters
+        """
+        # Reuse the assembled config until the Vault certificates expire or
+        # its files disappear (e.g. /tmp was cleaned)
+        if (
+            self._ssl_config is not None
+            and (not self.vault_enabled or time.monotonic() < self._cert_cache_expires)
+            and self._ssl_files_exist(self._ssl_config)
+        ):
+            return dict(self._ssl_config)
+
+        ssl_config = {
+            "ssl": "on",
+            "ssl_cert_file": None,
+            "ssl_key_file": None,
+            "ssl_ca_file": None,
+        }
+
+        if self.vault_enabled or self._has_local_certs():
+            # Get server certificates
+            server_cert = self.get_certificate("server_cert")
+            server_key = self.get_certificate("server_key")
+            ca_cert = self.get_certificate("ca_cert")
+
+            if server_cert and server_key:
+                # Write certificates to temporary files for PostgreSQL
+                cert_dir = SERVER_CERT_DIR
+
+                cert_files = [cert_dir / "server.crt", cert_dir / "server.key"]
+                if ca_cert:
+                    cert_files.append(cert_dir / "ca.crt")
+
+                # Only rewrite the files when the certificate content changed
+                # or one of them has been removed since the last write
+                content_hash = hashlib.blake2b(
+                    (server_cert + server_key + (ca_cert or "")).encode()
+                ).hexdigest()
+                if content_hash != self._written_hash or not all(
+                    path.exists() for path in cert_files
+                ):
+                    cert_dir.mkdir(exist_ok=True)
+                    self._write_private_file(cert_dir / "server.crt", server_cert)
+                    self._write_private_file(cert_dir / "server.key", server_key)
+                    if ca_cert:
+                        self._write_private_file(cert_dir / "ca.crt", ca_cert)
+                    self._written_hash = content_hash
+
+                ssl_config.update(
+                    {
+                        "ssl_cert_file": str(cert_dir / "server.crt"),
+                        "ssl_key_file": str(cert_dir / "server.key"),
+                    }
+                )
+
+                if ca_cert:
+                    ssl_config["ssl_ca_file"] = str(cert_dir / "ca.crt")
+
+        self._ssl_config = ssl_config
+        return dict(ssl_config)
+
+    @staticmethod
+    def _ssl_files_exist(ssl_config: Dict[str, Any]) -> bool:
+        """Check that the files referenced by an SSL config still exist."""
+        paths = (
+            ssl_config["ssl_cert_file"],
+            ssl_config["ssl_key_file"],
+            ssl_config["ssl_ca_file"],
+        )
+        return all(os.path.exists(path) for path in paths if path)
+
+    @staticmethod
+    def _write_private_file(path: Path, content: str) -> None:
+        """Write a file readable only by its owner."""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+
+    def _has_local_certs(self) -> bool:
+        """Check if local server certificates exist."""
+        cert_dir = Path(self.local_cert_dir)
+        return (cert_dir / "server.crt").exists() and (cert_dir / "server.key").exists()
+
+    def validate_certificates(self) -> Dict[str, bool]:
+        """
+        Validate that required server certificates are available.
+
+        Returns:
+            Dictionary with validation results for each certificate type
+        """
+        results = {}
+
+        for cert_type in ["server_cert", "server_key", "ca_cert"]:
+            cert_content = self.get_certificate(cert_type)
+            results[cert_type] = cert_content is not None
+
+        return results
+
+
+# Global server certificate manager instance, created on first use
+_server_cert_manager: Optional[ServerCertificateManager] = None
+
+
+def get_server_cert_manager() -> ServerCertificateManager:
+    """Get the global server certificate manager instance."""
+    global _server_cert_manager
+    if _server_cert_manager is None:
+        _server_cert_manager = ServerCertificateManager()
+    return _server_cert_manager
+
+
+def __getattr__(name: str) -> Any:
+    """Keep ``server_cert_manager`` available without creating it on import."""
+    if name == "server_cert_manager":
+        return get_server_cert_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,22 +1,47 @@
 """Database package for Brownie Metadata Database."""
 
+from typing import TYPE_CHECKING
+
+from .._lazy import make_lazy
 from .config import DatabaseSettings
 from .connection import DatabaseManager, get_database_manager, get_session
-from .models import (
-    AgentConfig,
-    AgentType,
-    Config,
-    ConfigStatus,
-    ConfigType,
-    Incident,
-    IncidentPriority,
-    IncidentStatus,
-    Organization,
-    Stats,
-    Team,
-    User,
-    UserRole,
-)
+
+if TYPE_CHECKING:
+    from .models import (
+        AgentConfig,
+        AgentType,
+        Config,
+        ConfigStatus,
+        ConfigType,
+        Incident,
+        IncidentPriority,
+        IncidentStatus,
+        Organization,
+        Stats,
+        Team,
+        User,
+        UserRole,
+    )
+
+# Models are only imported when one of them is first accessed
+_LAZY_IMPORTS = {
+    "AgentConfig": ".models",
+    "AgentType": ".models",
+    "Config": ".models",
+    "ConfigStatus": ".models",
+    "ConfigType": ".models",
+    "Incident": ".models",
+    "IncidentPriority": ".models",
+    "IncidentStatus": ".models",
+    "Organization": ".models",
+    "Stats": ".models",
+    "Team": ".models",
+    "User": ".models",
+    "UserRole": ".models",
+}
+
+__getattr__, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
 
 __all__ = [
     "DatabaseManager",
@@ -21,6 +21,13 @@ class DatabaseSettings(BaseSettings):
     max_overflow: int = Field(default=20, description="Max overflow connections")
     pool_timeout: int = Field(default=30, description="Pool timeout in seconds")
     pool_recycle: int = Field(default=3600, description="Pool recycle time in seconds")
+    pool_use_lifo: bool = Field(
+        default=True, description="Reuse the most recently returned connection"
+    )
+    pool_disable: bool = Field(
+        default=False,
+        description="Open a connection per checkout (e.g. behind PgBouncer)",
+    )
 
     # Migration settings
     alembic_config: str = Field(
@@ -29,8 +36,8 @@ class DatabaseSettings(BaseSettings):
 
     @property
     def database_url(self) -> str:
-        """Get the database URL for SQLAlchemy."""
-        return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
+        """Get the database URL for SQLAlchemy (psycopg 3 driver)."""
+        return f"postgresql+psycopg://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
     @property
     def async_database_url(self) -> str:
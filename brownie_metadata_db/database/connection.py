@@ -1,5 +1,6 @@
 """Database connection and session management."""
 
+import logging
 import os
 from typing import Optional, Union
 
@@ -7,18 +8,22 @@ import structlog
 from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 
 from brownie_metadata_db.certificates import CertificateValidator, cert_config
 
 from .config import DatabaseSettings
 
 logger = structlog.get_logger(__name__)
+# Checked by the pool listeners, which fire on every checkout and checkin
+_stdlib_logger = logging.getLogger(__name__)
 
 
 class DatabaseManager:
     """Manages database connections and sessions."""
 
+    __slots__ = ("settings", "_engine", "_session_factory")
+
     def __init__(self, settings: DatabaseSettings):
         self.settings = settings
         self._engine: Engine | None = None
@@ -67,35 +72,51 @@ class DatabaseManager:
             if os.path.exists(ca_cert):
                 connect_args["sslrootcert"] = ca_cert
 
-        engine = create_engine(
-            database_url,
-            poolclass=QueuePool,
-            pool_size=self.settings.pool_size,
-            max_overflow=self.settings.max_overflow,
-            pool_timeout=self.settings.pool_timeout,
-            pool_recycle=self.settings.pool_recycle,
-            echo=False,  # Set to True for SQL debugging
-            connect_args=connect_args,
-        )
+        if self.settings.pool_disable:
+            # An external pooler already pools connections; avoid double pooling
+            engine = create_engine(
+                database_url,
+                poolclass=NullPool,
+                echo=False,  # Set to True for SQL debugging
+                connect_args=connect_args,
+            )
+        else:
+            # LIFO keeps reusing the warmest connections and lets idle ones
+            # age out, instead of rotating through the whole pool
+            engine = create_engine(
+                database_url,
+                poolclass=QueuePool,
+                pool_size=self.settings.pool_size,
+                max_overflow=self.settings.max_overflow,
+                pool_timeout=self.settings.pool_timeout,
+                pool_recycle=self.settings.pool_recycle,
+                pool_use_lifo=self.settings.pool_use_lifo,
+                echo=False,  # Set to True for SQL debugging
+                connect_args=connect_args,
+            )
 
         # Add connection event listeners for logging
         @event.listens_for(engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record):
             """Set connection-level settings."""
-            logger.debug("Database connection established")
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Database connection established")
 
         @event.listens_for(engine, "checkout")
         def receive_checkout(dbapi_connection, connection_record, connection_proxy):
             """Log connection checkout."""
-            logger.debug("Database connection checked out")
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Database connection checked out")
 
         @event.listens_for(engine, "checkin")
         def receive_checkin(dbapi_connection, connection_record):
             """Log connection checkin."""
-            logger.debug("Database connection checked in")
+            if _stdlib_logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Database connection checked in")
 
         self._engine = engine
-        self._session_factory = sessionmaker(bind=engine)
+        # Keep loaded attributes after commit instead of reloading them
+        self._session_factory = sessionmaker(bind=engine, expire_on_commit=False)
 
         logger.info(
             "Database engine created",
@@ -0,0 +1,173 @@
+"""Environment settings for Alembic migrations.
+
+Alembic executes ``alembic/env.py`` as a fresh module on every command, so
+anything cached there is thrown away between runs. These helpers live in an
+importable module instead, which lets repeated in-process migrations (test
+suites, per-tenant migrate loops) resolve the environment only once.
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Mapping, Optional, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+# SSL modes that send sslmode and certificate paths to the server
+SSL_CERT_MODES = frozenset({"require", "verify-ca", "verify-full", "prefer"})
+
+
+@dataclass(frozen=True)
+class MigrationEnv:
+    """Database connection settings resolved from the environment."""
+
+    host: str
+    port: str
+    name: str
+    user: str
+    password: str
+    ssl_mode: str
+
+    # Certificate paths, only set when SSL is enabled and the files exist
+    client_cert: Optional[str] = None
+    client_key: Optional[str] = None
+    ca_cert: Optional[str] = None
+
+    # Connection pool settings
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_disabled: bool = False
+
+
+# Engines shared across migration runs, keyed by URL and connect arguments
+_engine_cache: Dict[Tuple[URL, FrozenSet[Tuple[str, str]]], Engine] = {}
+
+
+@lru_cache(maxsize=1)
+def get_migration_env() -> MigrationEnv:
+    """Resolve migration connection settings once per process.
+
+    Call ``get_migration_env.cache_clear()`` after changing the environment.
+    """
+    environ = os.environ
+    ssl_mode = environ.get("DB_SSL_MODE", "verify-full")
+
+    client_cert = client_key = ca_cert = None
+    if ssl_mode in SSL_CERT_MODES:
+        from brownie_metadata_db.certificates.config import CertificateConfig
+
+        # Create a new config instance to pick up environment variables
+        cert_config = CertificateConfig()
+        cert_paths = cert_config.get_client_cert_paths()
+
+        # One directory scan instead of a stat per certificate file
+        try:
+            with os.scandir(cert_config.cert_dir or ".") as entries:
+                present = {entry.name for entry in entries}
+        except OSError:
+            present = set()
+
+        if {cert_config.client_cert_file, cert_config.client_key_file} <= present:
+            client_cert = cert_paths["client_cert"]
+            client_key = cert_paths["client_key"]
+
+        if cert_config.ca_cert_file in present:
+            ca_cert = cert_paths["ca_cert"]
+
+    return MigrationEnv(
+        host=environ.get("DB_HOST", "localhost"),
+        port=environ.get("DB_PORT", "5432"),
+        name=environ.get("DB_NAME", "brownie_metadata"),
+        user=environ.get("DB_USER", "brownie-fastapi-server"),
+        password=environ.get("DB_PASSWORD", ""),
+        ssl_mode=ssl_mode,
+        client_cert=client_cert,
+        client_key=client_key,
+        ca_cert=ca_cert,
+        pool_size=int(environ.get("DB_POOL_SIZE", "5")),
+        max_overflow=int(environ.get("DB_MAX_OVERFLOW", "10")),
+        pool_disabled=environ.get("DB_POOL_DISABLE", "").lower() in ("1", "true"),
+    )
+
+
+@lru_cache(maxsize=None)
+def build_database_url(env: MigrationEnv) -> URL:
+    """Build the migration database URL (SSL is handled in connect_args).
+
+    Passwords containing ``@``, ``/`` or ``%`` need no escaping this way.
+    """
+    return URL.create(
+        "postgresql+psycopg",
+        username=env.user,
+        password=env.password or None,
+        host=env.host,
+        port=int(env.port),
+        database=env.name,
+    )
+
+
+@lru_cache(maxsize=None)
+def build_connect_args(env: MigrationEnv) -> Mapping[str, str]:
+    """Build the driver SSL arguments for certificate authentication.
+
+    The result is read-only so the cached mapping can be shared safely.
+    """
+    connect_args = {}
+
+    if env.ssl_mode in SSL_CERT_MODES:
+        connect_args["sslmode"] = env.ssl_mode
+
+        # Certificate paths are only set when the files exist
+        if env.client_cert and env.client_key:
+            connect_args["sslcert"] = env.client_cert
+            connect_args["sslkey"] = env.client_key
+
+        if env.ca_cert:
+            connect_args["sslrootcert"] = env.ca_cert
+    elif env.ssl_mode == "disable":
+        # For disable mode, explicitly disable SSL
+        connect_args["sslmode"] = "disable"
+
+    return MappingProxyType(connect_args)
+
+
+def get_migration_engine(database_url: URL, connect_args: Mapping[str, str]) -> Engine:
+    """Get a pooled engine for migrations, reused across Alembic invocations.
+
+    Reusing the engine amortizes the TCP/TLS handshake when migrations run
+    repeatedly in one process. Set ``DB_POOL_DISABLE=1`` to open a fresh
+    connection per run instead (e.g. behind PgBouncer).
+    """
+    key = (database_url, frozenset(connect_args.items()))
+    engine = _engine_cache.get(key)
+    if engine is not None:
+        return engine
+
+    env = get_migration_env()
+    if env.pool_disabled:
+        engine = create_engine(
+            database_url, poolclass=NullPool, connect_args=dict(connect_args)
+        )
+    else:
+        engine = create_engine(
+            database_url,
+            poolclass=QueuePool,
+            pool_size=env.pool_size,
+            max_overflow=env.max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=1800,
+            connect_args=dict(connect_args),
+        )
+
+    _engine_cache[key] = engine
+    return engine
+
+
+def dispose_migration_engines() -> None:
+    """Close all cached migration engines and their connections."""
+    for engine in _engine_cache.values():
+        engine.dispose()
+    _engine_cache.clear()
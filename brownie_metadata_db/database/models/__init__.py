@@ -1,12 +1,52 @@
 """Database models package."""
 
-from .agent_config import AgentConfig, AgentType
-from .config import Config, ConfigStatus, ConfigType
-from .incident import Incident, IncidentPriority, IncidentStatus
-from .organization import Organization
-from .stats import Stats
-from .team import Team
-from .user import User, UserRole
+from typing import TYPE_CHECKING, Any
+
+from ..._lazy import make_lazy
+
+if TYPE_CHECKING:
+    from .agent_config import AgentConfig, AgentType
+    from .config import Config, ConfigStatus, ConfigType
+    from .incident import Incident, IncidentPriority, IncidentStatus
+    from .organization import Organization
+    from .stats import Stats
+    from .team import Team
+    from .user import User, UserRole
+
+# Model modules are imported on first access to any exported name. They are
+# always loaded together, as relationships refer to the other models by name
+# and mapper configuration needs every class registered.
+_LAZY_IMPORTS = {
+    "Organization": ".organization",
+    "Team": ".team",
+    "User": ".user",
+    "UserRole": ".user",
+    "Incident": ".incident",
+    "IncidentStatus": ".incident",
+    "IncidentPriority": ".incident",
+    "AgentConfig": ".agent_config",
+    "AgentType": ".agent_config",
+    "Stats": ".stats",
+    "Config": ".config",
+    "ConfigType": ".config",
+    "ConfigStatus": ".config",
+}
+
+_load_export, __dir__ = make_lazy(globals(), _LAZY_IMPORTS)
+
+
+def load_models() -> None:
+    """Import all model modules, registering their tables on the metadata."""
+    for name in _LAZY_IMPORTS:
+        _load_export(name)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the models on first access to any of them."""
+    value = _load_export(name)
+    load_models()
+    return value
+
 
 __all__ = [
     "Organization",
@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,6 +23,9 @@ class AgentConfig(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, Version
     """Agent configuration model for Brownie agents."""
 
     __tablename__ = "agent_configs"
+    __table_args__ = (
+        Index("ix_agent_configs_organization_id_team_id", "organization_id", "team_id"),
+    )
 
     # Basic info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -70,7 +73,6 @@ class AgentConfig(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, Version
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Relationships
@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -32,6 +32,9 @@ class Config(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, VersionMixin
     """Configuration model for hierarchical configs."""
 
     __tablename__ = "configs"
+    __table_args__ = (
+        Index("ix_configs_organization_id_team_id", "organization_id", "team_id"),
+    )
 
     # Basic info
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -92,7 +95,6 @@ class Config(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, VersionMixin
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Relationships
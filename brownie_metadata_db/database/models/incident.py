@@ -4,7 +4,18 @@ import enum
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -48,6 +59,11 @@ class Incident(
     """Incident model for tracking incidents."""
 
     __tablename__ = "incidents"
+    __table_args__ = (
+        Index("ix_incidents_organization_id_team_id", "organization_id", "team_id"),
+        # Keeps the open-incident count cheap for the metrics sidecar
+        Index("ix_incidents_open", "id", postgresql_where=text("status = 'OPEN'")),
+    )
 
     # Basic info
     title: Mapped[str] = mapped_column(String(500), nullable=False)
@@ -93,7 +109,6 @@ class Incident(
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     created_by: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
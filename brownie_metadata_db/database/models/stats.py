@@ -2,7 +2,17 @@
 
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +23,9 @@ class Stats(BaseModel, TimestampMixin, OrgScopedMixin):
     """Stats model for metrics and analytics."""
 
     __tablename__ = "stats"
+    __table_args__ = (
+        Index("ix_stats_organization_id_team_id", "organization_id", "team_id"),
+    )
 
     # Basic info
     metric_name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
@@ -50,7 +63,6 @@ class Stats(BaseModel, TimestampMixin, OrgScopedMixin):
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Relationships
@@ -2,7 +2,7 @@
 
 import enum
 
-from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, Column, Enum, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,6 +27,9 @@ class User(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, SoftDeleteMixi
     """User model for team members."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_organization_id_team_id", "organization_id", "team_id"),
+    )
 
     # Basic info
     email: Mapped[str] = mapped_column(
@@ -70,7 +73,6 @@ class User(BaseModel, TimestampMixin, OrgScopedMixin, AuditMixin, SoftDeleteMixi
         UUID(as_uuid=True),
         ForeignKey("organizations.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Relationships
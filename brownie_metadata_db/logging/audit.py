@@ -2,16 +2,21 @@
 
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, FrozenSet, Optional
 
-from .config import get_logger
+from .config import get_logger, get_logging_config
 
 
 class AuditLogger:
     """Audit logging for tracking data changes."""
 
-    def __init__(self, logger_name: str = "audit"):
+    def __init__(
+        self, logger_name: str = "audit", events: Optional[FrozenSet[str]] = None
+    ):
         self.logger = get_logger(logger_name)
+        self.events = (
+            get_logging_config().audit_events if events is None else frozenset(events)
+        )
 
     def log_event(
         self,
@@ -24,7 +29,10 @@ class AuditLogger:
         changes: Optional[Dict[str, Any]] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> None:
-        """Log an audit event."""
+        """Log an audit event, skipping event types that are not audited."""
+        if event_type not in self.events:
+            return
+
         event_id = str(uuid.uuid4())
 
         self.logger.info(
@@ -2,12 +2,70 @@
 
 import logging
 import os
-from typing import List, Optional, Union
+from functools import lru_cache
+from typing import Any, FrozenSet, List, Optional, Tuple, Union
 
 import structlog
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _orjson_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize an event dict with orjson, keeping structlog's fallback."""
+    return orjson.dumps(
+        obj, default=kwargs.get("default"), option=orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+# Stateless processors shared by every configuration
+_FORMATTING_PROCESSORS = (
+    structlog.processors.StackInfoRenderer(),
+    structlog.processors.format_exc_info,
+    structlog.processors.UnicodeDecoder(),
+)
+_TIMESTAMPER = structlog.processors.TimeStamper(fmt="iso")
+
+# orjson serializes in C; fall back to the stdlib json module without it
+_JSON_RENDERER = (
+    structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+    if orjson is not None
+    else structlog.processors.JSONRenderer()
+)
+
+
+@lru_cache(maxsize=None)
+def _build_processors(
+    include_logger_name: bool,
+    include_log_level: bool,
+    include_timestamps: bool,
+    log_format: str,
+) -> Tuple[Any, ...]:
+    """Build the processor chain once per combination of settings."""
+    processors: List[Any] = [structlog.stdlib.filter_by_level]
+
+    if include_logger_name:
+        processors.append(structlog.stdlib.add_logger_name)
+
+    if include_log_level:
+        processors.append(structlog.stdlib.add_log_level)
+
+    processors.extend(_FORMATTING_PROCESSORS)
+
+    if include_timestamps:
+        processors.insert(-1, _TIMESTAMPER)
+
+    if log_format == "json":
+        processors.append(_JSON_RENDERER)
+    else:
+        processors.append(structlog.dev.ConsoleRenderer())
+
+    return tuple(processors)
+
 
 class LoggingConfig(BaseSettings):
     """Centralized logging configuration."""
@@ -28,8 +86,9 @@ class LoggingConfig(BaseSettings):
     slow_query_threshold: float = Field(
         default=1.0, description="Slow query threshold in seconds"
     )
-    audit_events: List[str] = Field(
-        default=["create", "update", "delete"], description="Events to audit"
+    audit_events: FrozenSet[str] = Field(
+        default=frozenset({"create", "update", "delete"}),
+        description="Events to audit",
     )
     log_performance: bool = Field(
         default=True, description="Enable performance logging"
@@ -42,55 +101,51 @@ class LoggingConfig(BaseSettings):
         """Get numeric log level."""
         return getattr(logging, self.level.upper(), logging.INFO)
 
-    def configure_structlog(self) -> None:
+    def configure_structlog(self, level: Optional[int] = None) -> None:
         """Configure structlog with current settings."""
-        processors = [
-            structlog.stdlib.filter_by_level,
-        ]
-
-        if self.include_logger_name:
-            processors.append(structlog.stdlib.add_logger_name)
-
-        if self.include_log_level:
-            processors.append(structlog.stdlib.add_log_level)
-
-        processors.extend(
-            [
-                structlog.stdlib.PositionalArgumentsFormatter(),  # type: ignore[list-item]
-                structlog.processors.StackInfoRenderer(),  # type: ignore[list-item]
-                structlog.processors.format_exc_info,  # type: ignore[list-item]
-                structlog.processors.UnicodeDecoder(),  # type: ignore[list-item]
-            ]
+        if level is None:
+            level = self.get_log_level()
+
+        processors = _build_processors(
+            self.include_logger_name,
+            self.include_log_level,
+            self.include_timestamps,
+            self.format,
         )
 
-        if self.include_timestamps:
-            processors.insert(-1, structlog.processors.TimeStamper(fmt="iso"))  # type: ignore[arg-type]
-
-        if self.format == "json":
-            processors.append(structlog.processors.JSONRenderer())  # type: ignore[arg-type]
-        else:
-            processors.append(structlog.dev.ConsoleRenderer())  # type: ignore[arg-type]
-
         structlog.configure(
             processors=processors,
             context_class=dict,
             logger_factory=structlog.stdlib.LoggerFactory(),
-            wrapper_class=structlog.stdlib.BoundLogger,
+            # Calls below the configured level are no-ops that skip the
+            # processor chain entirely
+            wrapper_class=structlog.make_filtering_bound_logger(level),
             cache_logger_on_first_use=True,
         )
 
 
+@lru_cache(maxsize=1)
+def get_logging_config() -> LoggingConfig:
+    """Load logging settings from the environment once per process.
+
+    Call ``get_logging_config.cache_clear()`` after changing the environment.
+    """
+    return LoggingConfig()
+
+
 def configure_logging(config: Optional[LoggingConfig] = None) -> LoggingConfig:
     """Configure logging for the application."""
     if config is None:
-        config = LoggingConfig()
+        config = get_logging_config()
+
+    level = config.get_log_level()
 
     # Configure structlog
-    config.configure_structlog()
+    config.configure_structlog(level)
 
     # Configure standard logging
     logging.basicConfig(
-        level=config.get_log_level(),
+        level=level,
         format="%(message)s",
         handlers=[logging.StreamHandler()],
     )
@@ -11,16 +11,28 @@ This sidecar collects and exports custom metrics for enterprise monitoring:
 """
 
 # Simple logging configuration for metrics sidecar
+import asyncio
 import logging
 import os
 import sys
+import threading
 import time
-from typing import Any, Dict
+from typing import Any, AsyncIterable, Dict, Iterable, List, Optional, Tuple
 
-import psycopg
-import redis
 import structlog
-from prometheus_client import Counter, Gauge, Histogram, Info, start_http_server
+import uvicorn
+from prometheus_client import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    Info,
+    make_asgi_app,
+)
+from prometheus_client.metrics_core import Metric
+from prometheus_client.registry import Collector, CollectorRegistry
+from psycopg_pool import AsyncConnectionPool
+from redis import asyncio as aioredis
 
 
 class LoggingConfig:
@@ -112,6 +124,94 @@ business_metrics = {
 }
 
 
+# INFO sections holding connected_clients, used_memory and keyspace hits/misses
+REDIS_INFO_SECTIONS = ("clients", "memory", "stats")
+
+# Above this many rows, table counts come from planner statistics
+# (pg_class.reltuples) instead of a full table scan
+COUNT_ESTIMATE_MIN_ROWS = 100_000
+
+
+def row_count_sql(table: str) -> str:
+    """SQL for a table's row count, estimated once the table is large."""
+    return (
+        f"(SELECT CASE WHEN c.reltuples >= {COUNT_ESTIMATE_MIN_ROWS} "
+        f"THEN c.reltuples::bigint ELSE (SELECT count(*) FROM {table}) END "
+        f"FROM pg_class c WHERE c.oid = '{table}'::regclass)"
+    )
+
+
+# Open incidents are counted exactly; the ix_incidents_open partial index
+# keeps that cheap regardless of how many incidents are closed
+BUSINESS_METRICS_QUERY = f"""
+    SELECT
+        pg_database_size(current_database()),
+        {row_count_sql("organizations")},
+        {row_count_sql("teams")},
+        {row_count_sql("users")},
+        {row_count_sql("incidents")},
+        (SELECT count(*) FROM incidents WHERE status = 'OPEN'),
+        {row_count_sql("agent_configs")}
+"""
+
+
+# Unordered, so rows stream from the server-side cursor as they are sized
+TABLE_SIZES_QUERY = """
+    SELECT tablename, pg_total_relation_size(schemaname||'.'||tablename)
+    FROM pg_tables
+    WHERE schemaname = 'public'
+"""
+TABLE_SIZES_BATCH = 256
+
+
+async def update_labelled_gauge(
+    gauge: Gauge, children: Dict[Any, Any], rows: AsyncIterable[Tuple[Any, float]]
+) -> None:
+    """Set one child per label value and drop series whose label has gone.
+
+    Without the removal, dropped tables and vanished connection states would
+    keep exporting their last value and grow the scrape indefinitely.
+    """
+    seen = set()
+    async for label, value in rows:
+        child = children.get(label)
+        if child is None:
+            child = children[label] = gauge.labels(label)
+        child.set(value)
+        seen.add(label)
+
+    for label in children.keys() - seen:
+        gauge.remove(label)
+        del children[label]
+
+
+class CachedRegistry(Collector):
+    """Registry view that reuses collected samples for a short TTL.
+
+    Retried or federated scrapes within the TTL share one collection (which
+    includes reading /proc for the process metrics). The lock makes
+    concurrent scrapes wait for a single collection instead of repeating it.
+    """
+
+    def __init__(self, registry: CollectorRegistry = REGISTRY, ttl: float = 1.0):
+        self.registry = registry
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._metrics: Optional[List[Metric]] = None
+        self._collected_at = 0.0
+
+    def collect(self) -> Iterable[Metric]:
+        with self._lock:
+            now = time.monotonic()
+            if self._metrics is None or now - self._collected_at >= self.ttl:
+                self._metrics = list(self.registry.collect())
+                self._collected_at = now
+            return iter(self._metrics)
+
+    def restricted_registry(self, names: Iterable[str]):
+        return self.registry.restricted_registry(names)
+
+
 class MetricsCollector:
     def __init__(self):
         self.db_config = {
@@ -135,30 +235,55 @@ class MetricsCollector:
         }
 
         self.metrics_port = int(os.getenv("METRICS_PORT", 9091))
+        self.metrics_cache_ttl = float(os.getenv("METRICS_CACHE_TTL", 1.0))
+
+        # Keep the SSL-negotiated connection between scrapes; opened in run().
+        # The same queries run every cycle, so prepare them on first use.
+        self.db_pool = AsyncConnectionPool(
+            kwargs={**self.db_config, "autocommit": True, "prepare_threshold": 0},
+            min_size=1,
+            max_size=2,
+            open=False,
+        )
+
+        # Label-bound gauges, resolved once per table / connection state
+        self.table_size_gauges: Dict[str, Any] = {}
+        self.connection_gauges: Dict[str, Any] = {}
+
+        # Redis clients connect lazily, so this is safe to build up front
+        self.redis = aioredis.Redis(**self.redis_config, max_connections=2)
+
+    async def close(self):
+        """Close the database connection pool and Redis client"""
+        await self.db_pool.close()
+        await self.redis.aclose()
 
-    def collect_database_metrics(self):
+    async def collect_database_metrics(self):
         """Collect database performance metrics"""
         try:
-            with psycopg.connect(**self.db_config) as conn:
-                with conn.cursor() as cur:
-                    # Database size
-                    cur.execute("SELECT pg_database_size(current_database())")
-                    db_size_bytes.set(cur.fetchone()[0])
-
-                    # Table sizes
-                    cur.execute(
-                        """
-                        SELECT schemaname, tablename, pg_total_relation_size(schemaname||'.'||tablename) as size
-                        FROM pg_tables 
-                        WHERE schemaname = 'public'
-                        ORDER BY size DESC
-                    """
-                    )
-                    for schema, table, size in cur.fetchall():
-                        db_table_sizes.labels(table_name=table).set(size)
+            async with self.db_pool.connection(timeout=10) as conn:
+                async with conn.cursor() as cur:
+                    # Database size and business metrics in a single round trip
+                    await cur.execute(BUSINESS_METRICS_QUERY)
+                    (
+                        db_size,
+                        organizations,
+                        teams,
+                        users,
+                        incidents,
+                        active_incidents,
+                        agent_configs,
+                    ) = await cur.fetchone()
+                    db_size_bytes.set(db_size)
+                    business_metrics["organizations_total"].set(organizations)
+                    business_metrics["teams_total"].set(teams)
+                    business_metrics["users_total"].set(users)
+                    business_metrics["incidents_total"].set(incidents)
+                    business_metrics["active_incidents"].set(active_incidents)
+                    business_metrics["agent_configs_total"].set(agent_configs)
 
                     # Connection stats
-                    cur.execute(
+                    await cur.execute(
                         """
                         SELECT state, count(*) 
                         FROM pg_stat_activity 
@@ -166,39 +291,37 @@ class MetricsCollector:
                         GROUP BY state
                     """
                     )
-                    for state, count in cur.fetchall():
-                        db_connections.labels(state=state).set(count)
-
-                    # Business metrics
-                    cur.execute("SELECT COUNT(*) FROM organizations")
-                    business_metrics["organizations_total"].set(cur.fetchone()[0])
-
-                    cur.execute("SELECT COUNT(*) FROM teams")
-                    business_metrics["teams_total"].set(cur.fetchone()[0])
-
-                    cur.execute("SELECT COUNT(*) FROM users")
-                    business_metrics["users_total"].set(cur.fetchone()[0])
-
-                    cur.execute("SELECT COUNT(*) FROM incidents")
-                    business_metrics["incidents_total"].set(cur.fetchone()[0])
-
-                    cur.execute("SELECT COUNT(*) FROM incidents WHERE status = 'OPEN'")
-                    business_metrics["active_incidents"].set(cur.fetchone()[0])
+                    await update_labelled_gauge(
+                        db_connections, self.connection_gauges, cur
+                    )
 
-                    cur.execute("SELECT COUNT(*) FROM agent_configs")
-                    business_metrics["agent_configs_total"].set(cur.fetchone()[0])
+                # Table sizes, streamed in batches so large multi-tenant
+                # catalogs are never held in memory at once. Server-side
+                # cursors need a transaction on an autocommit connection.
+                async with conn.transaction():
+                    async with conn.cursor(name="table_sizes") as tables:
+                        tables.itersize = TABLE_SIZES_BATCH
+                        await tables.execute(TABLE_SIZES_QUERY)
+                        await update_labelled_gauge(
+                            db_table_sizes, self.table_size_gauges, tables
+                        )
 
         except Exception as e:
             logger.error("Failed to collect database metrics", error=str(e))
             db_query_errors.labels(error_type="connection").inc()
 
-    def collect_redis_metrics(self):
+    async def collect_redis_metrics(self):
         """Collect Redis performance metrics"""
         try:
-            r = redis.Redis(**self.redis_config)
+            # Only the sections read below, fetched in a single round trip
+            pipe = self.redis.pipeline(transaction=False)
+            for section in REDIS_INFO_SECTIONS:
+                pipe.info(section)
+            info = {}
+            for section_info in await pipe.execute():
+                info.update(section_info)
 
             # Connection info
-            info = r.info()
             redis_connections.set(info.get("connected_clients", 0))
             redis_memory_usage.set(info.get("used_memory", 0))
 
@@ -215,25 +338,65 @@ class MetricsCollector:
         except Exception as e:
             logger.error("Failed to collect Redis metrics", error=str(e))
 
-    def run(self):
-        """Start the metrics collection server"""
-        logger.info(
-            "Starting Brownie Metadata Database metrics sidecar", port=self.metrics_port
+    async def collect_metrics(self):
+        """Collect database and Redis metrics concurrently"""
+        await asyncio.gather(
+            self.collect_database_metrics(), self.collect_redis_metrics()
         )
 
-        # Start Prometheus metrics server
-        start_http_server(self.metrics_port)
-
-        # Collect metrics every 30 seconds
+    async def collect_forever(self):
+        """Collect metrics every 30 seconds until cancelled"""
         while True:
             try:
-                self.collect_database_metrics()
-                self.collect_redis_metrics()
+                await self.collect_metrics()
                 logger.info("Metrics collected successfully")
             except Exception as e:
                 logger.error("Failed to collect metrics", error=str(e))
 
-            time.sleep(30)
+            await asyncio.sleep(30)
+
+    def build_metrics_server(self) -> uvicorn.Server:
+        """Build the ASGI server exposing the cached registry on /metrics"""
+        app = make_asgi_app(registry=CachedRegistry(ttl=self.metrics_cache_ttl))
+        return uvicorn.Server(
+            uvicorn.Config(
+                app,
+                host="0.0.0.0",
+                port=self.metrics_port,
+                loop="auto",
+                lifespan="off",
+                access_log=False,
+                log_config=None,
+            )
+        )
+
+    async def run_async(self, server: uvicorn.Server):
+        """Serve scrapes and collect metrics on the same event loop"""
+        await self.db_pool.open()
+        collection = asyncio.create_task(self.collect_forever())
+
+        try:
+            # Returns once the server has shut down (SIGINT / SIGTERM)
+            await server.serve()
+        finally:
+            # uvicorn re-raises the shutdown signal, which cancels this task
+            collection.cancel()
+            try:
+                await asyncio.gather(collection, return_exceptions=True)
+            finally:
+                await self.close()
+
+    def run(self):
+        """Start the metrics collection server"""
+        logger.info(
+            "Starting Brownie Metadata Database metrics sidecar", port=self.metrics_port
+        )
+
+        server = self.build_metrics_server()
+
+        # Use uvloop (and httptools) when installed, as uvicorn.run would
+        server.config.setup_event_loop()
+        asyncio.run(self.run_async(server))
 
 
 if __name__ == "__main__":
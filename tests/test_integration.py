@@ -25,14 +25,14 @@ def _is_postgres_available():
 
         # Try to connect with SSL first, then without SSL
         try:
-            import psycopg2
+            import psycopg
 
             # Try SSL connection with certificates first
             try:
-                conn = psycopg2.connect(
+                conn = psycopg.connect(
                     host="localhost",
                     port=5432,
-                    database="brownie_metadata",
+                    dbname="brownie_metadata",
                     user="brownie-fastapi-server",
                     sslmode="verify-full",  # Use verify-full for enterprise-level security
                     sslcert="dev-certs/client.crt",
@@ -90,7 +90,7 @@ class TestDatabaseSchema:
         """Test that we can import all database models."""
         try:
             # Test importing models from the database project
-            from database.models import (
+            from brownie_metadata_db.database.models import (
                 AgentConfig,
                 AgentType,
                 Config,
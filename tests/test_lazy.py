@@ -0,0 +1,33 @@
+"""Test lazy package exports."""
+
+import pytest
+
+from brownie_metadata_db._lazy import make_lazy
+
+
+class TestMakeLazy:
+    """Test make_lazy."""
+
+    def test_name_is_imported_on_first_access(self):
+        """Test a lazy name is imported and then stored in the globals."""
+        module_globals = {"__name__": "brownie_metadata_db"}
+        getattr_, _ = make_lazy(module_globals, {"cert_config": ".certificates"})
+
+        from brownie_metadata_db.certificates import cert_config
+
+        assert getattr_("cert_config") is cert_config
+        assert module_globals["cert_config"] is cert_config
+
+    def test_unknown_name_raises_attribute_error(self):
+        """Test names outside the mapping raise AttributeError."""
+        getattr_, _ = make_lazy({"__name__": "brownie_metadata_db"}, {})
+
+        with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+            getattr_("missing")
+
+    def test_dir_includes_lazy_names(self):
+        """Test dir() lists lazy names before they are imported."""
+        module_globals = {"__name__": "brownie_metadata_db", "loaded": 1}
+        _, dir_ = make_lazy(module_globals, {"lazy": ".backup"})
+
+        assert dir_() == ["__name__", "lazy", "loaded"]
@@ -1,12 +1,21 @@
 """Test logging configuration."""
 
+import json
 import logging
+import os
+from decimal import Decimal
 from unittest.mock import patch
 
 import pytest
+import structlog
 
 from src.logging.audit import AuditLogger
-from src.logging.config import LoggingConfig, configure_logging, get_logger
+from src.logging.config import (
+    LoggingConfig,
+    configure_logging,
+    get_logger,
+    get_logging_config,
+)
 from src.logging.performance import PerformanceLogger
 
 
@@ -22,10 +31,18 @@ class TestLoggingConfig:
         assert config.include_timestamps is True
         assert config.include_logger_name is True
         assert config.include_log_level is True
-        assert config.audit_events == ["create", "update", "delete"]
+        assert config.audit_events == frozenset({"create", "update", "delete"})
         assert config.log_performance is True
         assert config.slow_query_threshold == 1.0
 
+    def test_audit_events_from_env(self):
+        """Test audit events are parsed into a set for membership checks."""
+        with patch.dict(os.environ, {"LOG_AUDIT_EVENTS": '["create", "login"]'}):
+            config = LoggingConfig()
+
+        assert config.audit_events == frozenset({"create", "login"})
+        assert "login" in config.audit_events
+
     def test_get_log_level(self):
         """Test log level conversion."""
         config = LoggingConfig(level="DEBUG")
@@ -39,6 +56,30 @@ class TestLoggingConfig:
         config = configure_logging()
         assert isinstance(config, LoggingConfig)
 
+    def test_default_config_is_loaded_once(self):
+        """Test configure_logging reuses the settings loaded from the env."""
+        get_logging_config.cache_clear()
+        try:
+            first = configure_logging()
+            assert configure_logging() is first
+        finally:
+            get_logging_config.cache_clear()
+
+    def test_json_renderer(self):
+        """Test JSON log lines are valid JSON, including non-JSON values."""
+        configure_logging(LoggingConfig(format="json"))
+        renderer = structlog.get_config()["processors"][-1]
+
+        line = renderer(
+            None, "info", {"event": "test", "amount": Decimal("1.5"), 1: "x"}
+        )
+
+        assert json.loads(line) == {
+            "event": "test",
+            "amount": "Decimal('1.5')",
+            "1": "x",
+        }
+
     def test_get_logger(self):
         """Test getting a logger."""
         logger = get_logger("test")
@@ -75,6 +116,29 @@ class TestAuditLogger:
             assert call_args[1]["user_id"] == "user123"
             assert call_args[1]["org_id"] == "org456"
 
+    def test_unaudited_events_are_skipped(self):
+        """Test events missing from audit_events are not logged."""
+        logger = AuditLogger(events=frozenset({"create"}))
+
+        with patch.object(logger.logger, "info") as mock_info:
+            logger.log_event("delete", "incident", "inc123")
+            logger.log_access("incident", "inc123", "read")
+            mock_info.assert_not_called()
+
+            logger.log_event("create", "incident", "inc123")
+            mock_info.assert_called_once()
+
+    def test_audit_events_default_to_config(self):
+        """Test the audited events come from the logging configuration."""
+        with patch.dict(os.environ, {"LOG_AUDIT_EVENTS": '["access"]'}):
+            get_logging_config.cache_clear()
+            try:
+                logger = AuditLogger()
+            finally:
+                get_logging_config.cache_clear()
+
+        assert logger.events == frozenset({"access"})
+
     def test_log_create(self):
         """Test logging a create event."""
         logger = AuditLogger()
@@ -1,11 +1,28 @@
 """Test metrics sidecar functionality."""
 
+import asyncio
+import gzip
 import os
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
-
-from metrics_sidecar.__main__ import MetricsCollector
+from prometheus_client import (
+    CollectorRegistry,
+    Gauge,
+    generate_latest,
+    make_wsgi_app,
+)
+
+from metrics_sidecar.__main__ import (
+    COUNT_ESTIMATE_MIN_ROWS,
+    TABLE_SIZES_BATCH,
+    TABLE_SIZES_QUERY,
+    CachedRegistry,
+    MetricsCollector,
+    redis_hit_rate,
+    row_count_sql,
+    update_labelled_gauge,
+)
 
 
 class TestMetricsCollector:
@@ -45,105 +62,251 @@ class TestMetricsCollector:
             assert collector.redis_config["port"] == 6380
             assert collector.metrics_port == 9092
 
-    @patch("metrics_sidecar.__main__.psycopg.connect")
-    def test_collect_database_metrics_success(self, mock_connect):
+    def test_database_pool_is_not_opened_on_init(self):
+        """Test the connection pool is created closed until run() opens it."""
+        collector = MetricsCollector()
+
+        assert collector.db_pool.closed
+        assert collector.db_pool.min_size == 1
+        assert collector.db_pool.max_size == 2
+        assert collector.db_pool.kwargs["prepare_threshold"] == 0
+
+    @pytest.mark.asyncio
+    @patch("metrics_sidecar.__main__.AsyncConnectionPool")
+    async def test_collect_database_metrics_success(self, mock_pool_class):
         """Test successful database metrics collection."""
-        # Mock database connection and cursor
+        # Mock pooled database connection, cursor and server-side cursor
         mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_connect.return_value.__enter__.return_value = mock_conn
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-
-        # Mock query results
-        mock_cursor.fetchone.side_effect = [
-            (1024 * 1024,),  # Database size
-            (5,),  # Organizations count
-            (10,),  # Teams count
-            (25,),  # Users count
-            (3,),  # Incidents count
-            (1,),  # Active incidents count
-            (2,),  # Agent configs count
-        ]
-
-        # Mock fetchall results - table sizes and connection stats
-        def mock_fetchall():
-            # First call is table sizes, second call is connection stats
-            if not hasattr(mock_fetchall, "call_count"):
-                mock_fetchall.call_count = 0
-            mock_fetchall.call_count += 1
-
-            if mock_fetchall.call_count == 1:
-                # Table sizes query returns (schema, table, size) tuples
-                return [("public", "organizations", 1024), ("public", "teams", 2048)]
-            else:
-                # Connection stats query returns (state, count) tuples
-                return [("active", 5), ("idle", 2)]
-
-        mock_cursor.fetchall.side_effect = mock_fetchall
+        mock_cursor = AsyncMock()
+        mock_tables = AsyncMock()
+        mock_pool = mock_pool_class.return_value
+        mock_pool.connection.return_value.__aenter__.return_value = mock_conn
 
-        collector = MetricsCollector()
-        collector.collect_database_metrics()
+        def cursor(name=None):
+            cm = MagicMock()
+            cm.__aenter__.return_value = mock_tables if name else mock_cursor
+            return cm
 
-        # Verify database connection was attempted
-        mock_connect.assert_called_once()
+        mock_conn.cursor.side_effect = cursor
 
-        # Verify queries were executed (9 total: 1 size + 1 table sizes + 1 connections + 6 business metrics)
-        assert mock_cursor.execute.call_count >= 9  # Multiple queries executed
+        # Mock the combined size and business metrics row
+        mock_cursor.fetchone.return_value = (1024 * 1024, 5, 10, 25, 3, 1, 2)
 
-    @patch("metrics_sidecar.__main__.psycopg.connect")
-    def test_collect_database_metrics_failure(self, mock_connect):
+        # Connection stats and table sizes are read by iterating the cursors
+        mock_cursor.__aiter__.return_value = [("active", 5), ("idle", 2)]
+        mock_tables.__aiter__.return_value = [("organizations", 1024), ("teams", 2048)]
+
+        collector = MetricsCollector()
+        await collector.collect_database_metrics()
+
+        # Verify a pooled connection was checked out
+        mock_pool.connection.assert_called_once()
+
+        # Verify label-bound gauges are cached for the next scrape
+        assert set(collector.table_size_gauges) == {"organizations", "teams"}
+        assert set(collector.connection_gauges) == {"active", "idle"}
+
+        # Verify queries were batched (size and business metrics with
+        # connection stats, then table sizes)
+        assert mock_cursor.execute.call_count == 2
+
+        # Verify table sizes are streamed from a server-side cursor
+        mock_conn.cursor.assert_called_with(name="table_sizes")
+        assert mock_tables.itersize == TABLE_SIZES_BATCH
+        mock_tables.execute.assert_awaited_once_with(TABLE_SIZES_QUERY)
+
+    @pytest.mark.asyncio
+    async def test_stale_label_series_are_removed(self):
+        """Test series for labels missing from the latest results are dropped."""
+        gauge = Gauge(
+            "test_table_size_bytes",
+            "Test gauge",
+            ["table_name"],
+            registry=CollectorRegistry(),
+        )
+        children = {}
+
+        async def rows(*values):
+            for value in values:
+                yield value
+
+        await update_labelled_gauge(gauge, children, rows(("users", 10), ("old", 5)))
+        await update_labelled_gauge(gauge, children, rows(("users", 20)))
+
+        assert set(children) == {"users"}
+        samples = {s.labels["table_name"]: s.value for s in gauge.collect()[0].samples}
+        assert samples == {"users": 20}
+
+    def test_row_count_sql_uses_estimate_for_large_tables(self):
+        """Test large tables are counted from pg_class statistics."""
+        sql = row_count_sql("incidents")
+
+        assert f"c.reltuples >= {COUNT_ESTIMATE_MIN_ROWS}" in sql
+        assert "SELECT count(*) FROM incidents" in sql
+        assert "'incidents'::regclass" in sql
+
+    @pytest.mark.asyncio
+    @patch("metrics_sidecar.__main__.AsyncConnectionPool")
+    async def test_collect_database_metrics_failure(self, mock_pool_class):
         """Test database metrics collection failure handling."""
-        mock_connect.side_effect = Exception("Connection failed")
+        mock_pool_class.return_value.connection.side_effect = Exception(
+            "Connection failed"
+        )
 
         collector = MetricsCollector()
 
         # Should not raise exception
-        collector.collect_database_metrics()
+        await collector.collect_database_metrics()
 
-    @patch("metrics_sidecar.__main__.redis.Redis")
-    def test_collect_redis_metrics_success(self, mock_redis_class):
+    @pytest.mark.asyncio
+    @patch("metrics_sidecar.__main__.aioredis.Redis")
+    async def test_collect_redis_metrics_success(self, mock_redis_class):
         """Test successful Redis metrics collection."""
         # Mock Redis connection
         mock_redis = MagicMock()
         mock_redis_class.return_value = mock_redis
 
-        # Mock Redis info response
-        mock_redis.info.return_value = {
-            "connected_clients": 5,
-            "used_memory": 1024 * 1024,
-            "keyspace_hits": 100,
-            "keyspace_misses": 20,
-        }
+        # Mock Redis info responses for the clients, memory and stats sections
+        mock_pipe = mock_redis.pipeline.return_value
+        mock_pipe.execute = AsyncMock(
+            return_value=[
+                {"connected_clients": 5},
+                {"used_memory": 1024 * 1024},
+                {"keyspace_hits": 100, "keyspace_misses": 20},
+            ]
+        )
 
         collector = MetricsCollector()
-        collector.collect_redis_metrics()
+        await collector.collect_redis_metrics()
+        await collector.collect_redis_metrics()
 
-        # Verify Redis connection was attempted
+        # Verify the Redis client is created once and reused
         mock_redis_class.assert_called_once()
-        mock_redis.info.assert_called_once()
+        assert mock_pipe.execute.call_count == 2
 
-    @patch("metrics_sidecar.__main__.redis.Redis")
-    def test_collect_redis_metrics_failure(self, mock_redis_class):
+        # Verify only the needed INFO sections are requested
+        sections = [c.args[0] for c in mock_pipe.info.call_args_list[:3]]
+        assert sections == ["clients", "memory", "stats"]
+        assert redis_hit_rate._value.get() == pytest.approx(100 / 120)
+
+    @pytest.mark.asyncio
+    @patch("metrics_sidecar.__main__.aioredis.Redis")
+    async def test_collect_redis_metrics_failure(self, mock_redis_class):
         """Test Redis metrics collection failure handling."""
-        mock_redis_class.side_effect = Exception("Redis connection failed")
+        mock_redis_class.return_value.pipeline.return_value.execute = AsyncMock(
+            side_effect=Exception("Redis connection failed")
+        )
 
         collector = MetricsCollector()
 
         # Should not raise exception
-        collector.collect_redis_metrics()
+        await collector.collect_redis_metrics()
+
+    @pytest.mark.asyncio
+    async def test_collect_metrics_runs_both_collectors(self):
+        """Test database and Redis metrics are collected together."""
+        collector = MetricsCollector()
+
+        with patch.object(
+            collector, "collect_database_metrics", AsyncMock()
+        ) as mock_db:
+            with patch.object(
+                collector, "collect_redis_metrics", AsyncMock()
+            ) as mock_redis:
+                await collector.collect_metrics()
+
+        mock_db.assert_awaited_once()
+        mock_redis.assert_awaited_once()
+
+    def test_metrics_server_uses_cached_registry(self):
+        """Test the ASGI app serves a CachedRegistry on the metrics port."""
+        with patch.dict(os.environ, {"METRICS_CACHE_TTL": "5"}):
+            collector = MetricsCollector()
 
-    @patch("metrics_sidecar.__main__.start_http_server")
-    @patch("metrics_sidecar.__main__.time.sleep")
-    def test_run_method(self, mock_sleep, mock_start_server):
-        """Test the run method starts server and collects metrics."""
-        # Mock sleep to prevent infinite loop
-        mock_sleep.side_effect = KeyboardInterrupt()
+        with patch("metrics_sidecar.__main__.make_asgi_app") as mock_make_app:
+            server = collector.build_metrics_server()
+
+        registry = mock_make_app.call_args.kwargs["registry"]
+        assert isinstance(registry, CachedRegistry)
+        assert registry.ttl == 5.0
+        assert server.config.app is mock_make_app.return_value
+        assert server.config.port == 9091
+        assert server.config.host == "0.0.0.0"
+        assert server.config.access_log is False
+
+    @patch("metrics_sidecar.__main__.aioredis.Redis")
+    @patch("metrics_sidecar.__main__.AsyncConnectionPool")
+    def test_run_method(self, mock_pool_class, mock_redis_class):
+        """Test run serves metrics and collects on one event loop."""
+        mock_pool_class.return_value.open = AsyncMock()
+        mock_pool_class.return_value.close = AsyncMock()
+        mock_redis_class.return_value.aclose = AsyncMock()
 
         collector = MetricsCollector()
+        collected = asyncio.Event()
+        collector.collect_metrics = AsyncMock(side_effect=collected.set)
 
-        # Should raise KeyboardInterrupt when sleep is interrupted
-        with pytest.raises(KeyboardInterrupt):
+        # Stand-in for uvicorn serving until shutdown
+        async def serve():
+            await collected.wait()
+
+        server = MagicMock()
+        server.serve = serve
+
+        with patch.object(collector, "build_metrics_server", return_value=server):
             collector.run()
 
-        # Verify HTTP server was started
-        mock_start_server.assert_called_once_with(9091)
+        collector.collect_metrics.assert_awaited_once()
+        server.config.setup_event_loop.assert_called_once()
+
+        # Verify the pool was opened and closed again on shutdown
+        mock_pool_class.return_value.open.assert_awaited_once()
+        mock_pool_class.return_value.close.assert_awaited_once()
+        mock_redis_class.return_value.aclose.assert_awaited_once()
+
+
+class TestCachedRegistry:
+    """Test CachedRegistry class."""
+
+    def test_collect_is_reused_within_ttl(self):
+        """Test samples are collected once per TTL window."""
+        registry = CollectorRegistry()
+        gauge = Gauge("test_gauge", "Test gauge", registry=registry)
+        cached = CachedRegistry(registry, ttl=60)
+
+        gauge.set(1)
+        first = generate_latest(cached)
+        gauge.set(2)
+
+        assert generate_latest(cached) == first
+
+        cached.ttl = 0
+        assert generate_latest(cached) != first
+
+    @pytest.mark.parametrize(
+        "accept, content_type",
+        [
+            ("application/openmetrics-text; version=1.0.0", "application/openmetrics"),
+            ("text/plain", "text/plain; version=0.0.4"),
+        ],
+    )
+    def test_exposition_format_is_negotiated(self, accept, content_type):
+        """Test the cached registry keeps Accept-based format negotiation."""
+        registry = CollectorRegistry()
+        Gauge("test_gauge", "Test gauge", registry=registry).set(1)
+        app = make_wsgi_app(CachedRegistry(registry))
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": "/metrics",
+            "QUERY_STRING": "",
+            "HTTP_ACCEPT": accept,
+            "HTTP_ACCEPT_ENCODING": "gzip",
+        }
+        start_response = Mock()
+
+        body = b"".join(app(environ, start_response))
+
+        headers = dict(start_response.call_args.args[1])
+        assert headers["Content-Type"].startswith(content_type)
+        assert headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(body).startswith(b"# HELP test_gauge")
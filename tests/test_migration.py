@@ -20,12 +20,12 @@ def _is_postgres_available():
 
         # Also check if we can connect with SSL (required for this test)
         try:
-            import psycopg2
+            import psycopg
 
-            conn = psycopg2.connect(
+            conn = psycopg.connect(
                 host="localhost",
                 port=5432,
-                database="brownie_metadata",
+                dbname="brownie_metadata",
                 user="brownie-fastapi-server",
                 sslmode="verify-full",
             )
@@ -0,0 +1,225 @@
+"""Test migration environment settings."""
+
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import NullPool, QueuePool
+
+from alembic import command
+from alembic.config import Config
+from brownie_metadata_db.database import migration_env
+from brownie_metadata_db.database.migration_env import (
+    MigrationEnv,
+    build_connect_args,
+    build_database_url,
+    dispose_migration_engines,
+    get_migration_engine,
+    get_migration_env,
+)
+
+ALEMBIC_DIR = Path(__file__).parent.parent / "alembic"
+
+REVISION_TEMPLATE = """
+import sqlalchemy as sa
+from alembic import op
+
+revision = {revision!r}
+down_revision = {down_revision!r}
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table({table!r}, sa.Column("id", sa.Integer, primary_key=True))
+
+
+def downgrade():
+    op.drop_table({table!r})
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_migration_env_cache():
+    """Reset the cached settings around each test."""
+    get_migration_env.cache_clear()
+    yield
+    get_migration_env.cache_clear()
+    dispose_migration_engines()
+
+
+class TestMigrationEnv:
+    """Test get_migration_env."""
+
+    def test_reads_environment(self):
+        """Test settings are read from DB_* environment variables."""
+        env_vars = {
+            "DB_HOST": "test-host",
+            "DB_PORT": "5433",
+            "DB_NAME": "test_db",
+            "DB_USER": "test_user",
+            "DB_PASSWORD": "secret",
+            "DB_SSL_MODE": "disable",
+        }
+
+        with patch.dict(os.environ, env_vars):
+            env = get_migration_env()
+
+        assert env.host == "test-host"
+        assert env.port == "5433"
+        assert env.name == "test_db"
+        assert env.user == "test_user"
+        assert env.password == "secret"
+        assert env.ssl_mode == "disable"
+        assert env.client_cert is None
+        assert env.ca_cert is None
+
+    def test_result_is_cached(self):
+        """Test the environment is only resolved once."""
+        with patch.dict(os.environ, {"DB_HOST": "first", "DB_SSL_MODE": "disable"}):
+            first = get_migration_env()
+
+        with patch.dict(os.environ, {"DB_HOST": "second", "DB_SSL_MODE": "disable"}):
+            assert get_migration_env() is first
+
+    def test_existing_certificates_are_resolved(self, tmp_path):
+        """Test certificate paths are only set when the files exist."""
+        (tmp_path / "client.crt").write_text("cert")
+        (tmp_path / "client.key").write_text("key")
+
+        with patch.dict(
+            os.environ, {"DB_SSL_MODE": "verify-full", "CERT_DIR": str(tmp_path)}
+        ):
+            env = get_migration_env()
+
+        assert env.client_cert == str(tmp_path / "client.crt")
+        assert env.client_key == str(tmp_path / "client.key")
+        assert env.ca_cert is None
+
+
+class TestMigrationConnectArgs:
+    """Test the cached URL and connect argument builders."""
+
+    def make_env(self, **overrides):
+        """Build migration settings with test defaults."""
+        settings = dict(
+            host="db",
+            port="5432",
+            name="test_db",
+            user="test_user",
+            password="",
+            ssl_mode="disable",
+        )
+        settings.update(overrides)
+        return MigrationEnv(**settings)
+
+    def test_database_url(self):
+        """Test the password is only included when set."""
+        url = build_database_url(self.make_env())
+        assert (
+            url.render_as_string() == "postgresql+psycopg://test_user@db:5432/test_db"
+        )
+
+        url = build_database_url(self.make_env(password="p@ss/w%rd"))
+        assert url.password == "p@ss/w%rd"
+        assert url.port == 5432
+
+    def test_ssl_connect_args(self):
+        """Test certificate paths are passed through in SSL modes."""
+        env = self.make_env(
+            ssl_mode="verify-full", client_cert="c.crt", client_key="c.key"
+        )
+
+        assert dict(build_connect_args(env)) == {
+            "sslmode": "verify-full",
+            "sslcert": "c.crt",
+            "sslkey": "c.key",
+        }
+        assert dict(build_connect_args(self.make_env())) == {"sslmode": "disable"}
+
+    def test_connect_args_are_cached_and_read_only(self):
+        """Test the same read-only mapping is returned for equal settings."""
+        connect_args = build_connect_args(self.make_env())
+
+        assert build_connect_args(self.make_env()) is connect_args
+        with pytest.raises(TypeError):
+            connect_args["sslmode"] = "require"
+
+
+class TestMigrationEngine:
+    """Test get_migration_engine."""
+
+    url = URL.create("postgresql+psycopg", username="test", database="test_db")
+
+    def test_engine_is_reused(self):
+        """Test the same engine is returned for the same URL and arguments."""
+        with patch.dict(os.environ, {"DB_SSL_MODE": "disable"}):
+            engine = get_migration_engine(self.url, {"sslmode": "disable"})
+
+            assert isinstance(engine.pool, QueuePool)
+            assert get_migration_engine(self.url, {"sslmode": "disable"}) is engine
+            assert get_migration_engine(self.url, {"sslmode": "require"}) is not engine
+
+    def test_pool_can_be_disabled(self):
+        """Test DB_POOL_DISABLE falls back to one connection per run."""
+        with patch.dict(os.environ, {"DB_SSL_MODE": "disable", "DB_POOL_DISABLE": "1"}):
+            engine = get_migration_engine(self.url, {})
+
+        assert isinstance(engine.pool, NullPool)
+
+
+class TestFastNoop:
+    """Test BROWNIE_ALEMBIC_FAST_NOOP in alembic/env.py."""
+
+    def make_script_dir(self, path):
+        """Copy env.py next to two test revisions creating one table each."""
+        (path / "versions").mkdir()
+        shutil.copy(ALEMBIC_DIR / "env.py", path / "env.py")
+        shutil.copy(ALEMBIC_DIR / "script.py.mako", path / "script.py.mako")
+
+        for revision, down_revision, table in (
+            ("first", None, "first_table"),
+            ("second", "first", "second_table"),
+        ):
+            (path / "versions" / f"{revision}.py").write_text(
+                REVISION_TEMPLATE.format(
+                    revision=revision, down_revision=down_revision, table=table
+                )
+            )
+
+        config = Config()
+        config.set_main_option("script_location", str(path))
+        return config
+
+    def test_pending_revisions_are_committed(self, tmp_path):
+        """Test the revision check does not leave migrations uncommitted."""
+        config = self.make_script_dir(tmp_path)
+        database_url = f"sqlite:///{tmp_path / 'test.db'}"
+        engine = create_engine(database_url)
+
+        env_vars = {"BROWNIE_ALEMBIC_FAST_NOOP": "1", "DB_SSL_MODE": "disable"}
+        with patch.dict(os.environ, env_vars):
+            with patch.object(
+                migration_env, "get_migration_engine", return_value=engine
+            ):
+                command.upgrade(config, "first")
+                command.upgrade(config, "head")
+                # Already at head: returns before configuring the context
+                command.upgrade(config, "head")
+        engine.dispose()
+
+        # A fresh engine only sees committed changes
+        check_engine = create_engine(database_url)
+        with check_engine.connect() as connection:
+            version = connection.execute(
+                text("SELECT version_num FROM alembic_version")
+            ).scalar_one()
+            tables = set(inspect(connection).get_table_names())
+        check_engine.dispose()
+
+        assert version == "second"
+        assert {"first_table", "second_table"} <= tables
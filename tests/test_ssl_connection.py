@@ -2,13 +2,9 @@
 """Test SSL connection to PostgreSQL."""
 
 import os
-import sys
 
 from sqlalchemy import create_engine
 
-# Add the src directory to the Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
-
 
 def test_ssl_connection():
     """Test SSL connection to PostgreSQL."""